@@ -8,6 +8,7 @@ API Base: https://gamma-api.polymarket.com
 """
 
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
 
@@ -16,6 +17,7 @@ class GammaClient:
 
     BASE_URL = "https://gamma-api.polymarket.com"
     TIMEOUT = 10
+    PAGE_SIZE = 100
 
     def __init__(self, logger=None):
         """
@@ -75,6 +77,7 @@ class GammaClient:
         limit: int = 100,
         order: str = "volume24hr",
         ascending: bool = False,
+        offset: int = 0,
     ) -> List[Dict[str, Any]]:
         """
         Fetch markets with volume and liquidity data.
@@ -85,6 +88,7 @@ class GammaClient:
             limit: Maximum number of markets to return.
             order: Field to order by (volume24hr, volumeNum, liquidityNum).
             ascending: Sort ascending if True, descending if False.
+            offset: Number of markets to skip (for pagination).
 
         Returns:
             List of market dictionaries with volume data.
@@ -94,6 +98,8 @@ class GammaClient:
             "order": order,
             "ascending": str(ascending).lower(),
         }
+        if offset:
+            params["offset"] = offset
         if active:
             params["active"] = "true"
         if not closed:
@@ -114,6 +120,44 @@ class GammaClient:
 
         return self._normalize_markets(markets)
 
+    def get_markets_paged(
+        self,
+        limit: int = 100,
+        max_workers: int = 4,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch up to `limit` markets as concurrent PAGE_SIZE pages.
+
+        Pages are requested in parallel over the shared session and
+        concatenated in offset order, so the result matches a single
+        large request. Small limits fall through to one get_markets call.
+
+        Args:
+            limit: Maximum number of markets to return.
+            max_workers: Maximum concurrent page requests.
+            **kwargs: Filters passed through to get_markets.
+
+        Returns:
+            List of market dictionaries with volume data.
+        """
+        if limit <= self.PAGE_SIZE:
+            return self.get_markets(limit=limit, **kwargs)
+
+        offsets = range(0, limit, self.PAGE_SIZE)
+
+        def fetch_page(offset: int) -> List[Dict[str, Any]]:
+            page_limit = min(self.PAGE_SIZE, limit - offset)
+            return self.get_markets(limit=page_limit, offset=offset, **kwargs)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(offsets))) as pool:
+            pages = list(pool.map(fetch_page, offsets))
+
+        markets = []
+        for page in pages:
+            markets.extend(page)
+        return markets
+
     def get_market_by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
         """
         Fetch a single market by its slug.
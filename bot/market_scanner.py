@@ -292,15 +292,23 @@ class MarketScanner:
         token_id: str,
     ) -> bool:
         """Apply filters that do not require orderbook calls."""
-        min_odds = self.filters.get("min_odds", 0.30)
-        max_odds = self.filters.get("max_odds", 0.70)
-        max_spread = self.filters.get("max_spread_percent", 5.0)
+        return self._metadata_filter_reason(
+            volume_usd, liquidity, days_to_resolve, token_id
+        ) is None
+
+    def _metadata_filter_reason(
+        self,
+        volume_usd: float,
+        liquidity: float,
+        days_to_resolve: int,
+        token_id: str,
+    ) -> Optional[str]:
+        """Return why metadata filters reject a market, or None if it passes."""
         min_volume = self.filters.get("min_volume_usd", 100.0)
         min_volume_24h = self.filters.get("min_volume_24h", 0)
         min_liquidity = self.filters.get("min_liquidity", 0)
         min_days = self.filters.get("min_days_to_resolve", 2)
         max_days = self.filters.get("max_days_to_resolve", 30)
-        _ = (min_odds, max_odds, max_spread)
 
         # Volume check (use min_volume_24h if set, else min_volume_usd)
         effective_min_vol = min_volume_24h if min_volume_24h > 0 else min_volume
@@ -310,7 +318,7 @@ class MarketScanner:
                 self.logger.info(msg)
             else:
                 self.logger.debug(msg)
-            return False
+            return f"volume_too_low ({volume_usd:.2f} < {effective_min_vol})"
 
         # Liquidity check (only if Gamma data available and filter set)
         if min_liquidity > 0 and liquidity > 0 and liquidity < min_liquidity:
@@ -319,18 +327,18 @@ class MarketScanner:
                 self.logger.info(msg)
             else:
                 self.logger.debug(msg)
-            return False
+            return f"liquidity_too_low ({liquidity:.2f} < {min_liquidity})"
 
         # Resolution date checks
         if days_to_resolve == 9999 and self.allow_missing_resolution:
-            return True
+            return None
 
         # CRITICAL: Reject markets resolving too soon (avoid resolved markets)
         if days_to_resolve < min_days:
             self.logger.info(
                 f"Rejected {token_id[:8]}: resolves too soon (days={days_to_resolve} < {min_days})"
             )
-            return False
+            return f"days_too_soon ({days_to_resolve} < {min_days})"
 
         if days_to_resolve > max_days:
             msg = f"Rejected {token_id[:8]}: days={days_to_resolve} > {max_days}"
@@ -338,14 +346,22 @@ class MarketScanner:
                 self.logger.info(msg)
             else:
                 self.logger.debug(msg)
-            return False
+            return f"days_too_far ({days_to_resolve} > {max_days})"
 
-        return True
+        return None
 
     def _passes_price_filters(
         self, odds: float, spread_percent: float, token_id: str, days_to_resolve: int
     ) -> bool:
         """Apply filters that require orderbook data."""
+        return self._price_filter_reason(
+            odds, spread_percent, token_id, days_to_resolve
+        ) is None
+
+    def _price_filter_reason(
+        self, odds: float, spread_percent: float, token_id: str, days_to_resolve: int
+    ) -> Optional[str]:
+        """Return why price filters reject a market, or None if it passes."""
         min_odds = self.filters.get("min_odds", 0.30)
         max_odds = self.filters.get("max_odds", 0.70)
         max_spread = self.filters.get("max_spread_percent", 5.0)
@@ -356,15 +372,15 @@ class MarketScanner:
                 self.logger.info(msg)
             else:
                 self.logger.debug(msg)
-            return False
+            return f"odds_out_of_range ({odds:.2f} not in [{min_odds}, {max_odds}])"
         if spread_percent > max_spread:
             msg = f"Rejected {token_id[:8]}: spread={spread_percent:.1f}% > {max_spread}"
             if self.verbose_filters:
                 self.logger.info(msg)
             else:
                 self.logger.debug(msg)
-            return False
-        return True
+            return f"spread_too_wide ({spread_percent:.2f}% > {max_spread}%)"
+        return None
 
     def _select_market_source(self):
         """Select which API endpoint to use for market discovery."""
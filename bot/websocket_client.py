@@ -20,6 +20,7 @@ class OrderbookSnapshot:
     timestamp: float
     bids: List[tuple]  # [(price, size), ...]
     asks: List[tuple]  # [(price, size), ...]
+    received_at: float = 0.0  # Local time.time() of the last book/delta
 
     @property
     def best_bid(self) -> float:
@@ -92,6 +93,8 @@ class PolymarketWebSocket:
         self.orderbooks: Dict[str, OrderbookSnapshot] = {}
         self.callbacks: List[Callable] = []
         self.running = False
+        # True only while a connection is open; cleared on disconnect
+        self.connected = False
 
         # Config
         self.reconnect_delay = self.config.get("websocket_reconnect_delay", 5)
@@ -116,6 +119,7 @@ class PolymarketWebSocket:
             )
             self.logger.info("WebSocket connected to Polymarket")
             self.reconnect_count = 0
+            self.connected = True
             return True
 
         except ImportError:
@@ -183,34 +187,43 @@ class PolymarketWebSocket:
         self.running = True
         self.logger.info("WebSocket message loop started")
 
-        while self.running:
-            try:
-                if not self.ws:
-                    if not await self.connect():
-                        await asyncio.sleep(self.reconnect_delay)
-                        continue
-
-                message = await self.ws.recv()
-                self.messages_received += 1
-                self.last_message_time = time.time()
-                await self._handle_message(message)
-
-            except websockets.ConnectionClosed:
-                self.logger.warn("WebSocket connection closed")
-
-                if auto_reconnect and self.reconnect_count < self.max_reconnects:
-                    await self._reconnect()
-                else:
-                    self.logger.error("Max reconnects reached, stopping WebSocket")
+        try:
+            while self.running:
+                try:
+                    if not self.ws:
+                        if not await self.connect():
+                            await asyncio.sleep(self.reconnect_delay)
+                            continue
+
+                    message = await self.ws.recv()
+                    self.messages_received += 1
+                    self.last_message_time = time.time()
+                    await self._handle_message(message)
+
+                except websockets.ConnectionClosed:
+                    self.logger.warn("WebSocket connection closed")
+                    # Deltas are lost while disconnected, so cached books can't
+                    # be trusted; resubscribing after reconnect resends them
+                    self.connected = False
+                    self.orderbooks.clear()
+
+                    if auto_reconnect and self.reconnect_count < self.max_reconnects:
+                        await self._reconnect()
+                    else:
+                        self.logger.error("Max reconnects reached, stopping WebSocket")
+                        break
+
+                except asyncio.CancelledError:
+                    self.logger.info("WebSocket task cancelled")
                     break
 
-            except asyncio.CancelledError:
-                self.logger.info("WebSocket task cancelled")
-                break
-
-            except Exception as exc:
-                self.logger.error(f"WebSocket error: {exc}")
-                await asyncio.sleep(1)
+                except Exception as exc:
+                    self.logger.error(f"WebSocket error: {exc}")
+                    await asyncio.sleep(1)
+        finally:
+            # Also reached when reconnects run out, so callers checking
+            # `running` see that the stream is dead
+            self.running = False
 
         self.logger.info("WebSocket message loop stopped")
 
@@ -283,17 +296,41 @@ class PolymarketWebSocket:
             self.logger.debug(f"Unknown message type: {msg_type}, keys: {list(data.keys())}")
 
     async def _handle_price_change(self, data: dict):
-        """Handle price_change messages as lightweight orderbook updates."""
-        token_id = data.get("asset_id") or data.get("market")
-        if not token_id:
-            return
+        """Apply price_change level updates to cached orderbooks."""
+        changes = data.get("price_changes")
+        if changes is None:
+            # Older payloads carry one asset per message with a "changes" list
+            token_id = data.get("asset_id") or data.get("market")
+            if not token_id:
+                return
+            changes = [dict(change, asset_id=token_id) for change in data.get("changes", [])]
+
+        now = time.time()
+        for change in changes:
+            snapshot = self.orderbooks.get(change.get("asset_id"))
+            if snapshot is None:
+                continue
+
+            side = str(change.get("side", "")).upper()
+            if side == "BUY":
+                levels = snapshot.bids
+            elif side == "SELL":
+                levels = snapshot.asks
+            else:
+                continue
+
+            try:
+                price = float(change["price"])
+                size = float(change["size"])
+            except (KeyError, ValueError, TypeError):
+                continue
 
-        # Update cached orderbook if we have one
-        if token_id in self.orderbooks:
-            snapshot = self.orderbooks[token_id]
-            # Price change messages might have price/side info
-            # For now, just mark as recently updated
-            snapshot.timestamp = time.time()
+            # Size is the new total at that price; zero removes the level
+            levels[:] = [level for level in levels if level[0] != price]
+            if size > 0:
+                levels.append((price, size))
+            snapshot.timestamp = now
+            snapshot.received_at = now
 
     def _parse_orderbook(self, data: dict) -> OrderbookSnapshot:
         """
@@ -305,7 +342,8 @@ class PolymarketWebSocket:
         Returns:
             OrderbookSnapshot with bids/asks
         """
-        token_id = data.get("market", "")
+        # "asset_id" is the token; older payloads only carried "market"
+        token_id = data.get("asset_id") or data.get("market", "")
         timestamp = data.get("timestamp", time.time())
 
         # Parse bids (buy orders)
@@ -331,7 +369,8 @@ class PolymarketWebSocket:
                 continue
 
         return OrderbookSnapshot(
-            token_id=token_id, timestamp=timestamp, bids=bids, asks=asks
+            token_id=token_id, timestamp=timestamp, bids=bids, asks=asks,
+            received_at=time.time(),
         )
 
     async def _reconnect(self):
@@ -350,6 +389,59 @@ class PolymarketWebSocket:
             if self.subscribed_tokens:
                 await self.subscribe(self.subscribed_tokens.copy())
 
+    async def collect_snapshots(
+        self, token_ids: List[str], timeout: float = 10.0
+    ) -> Dict[str, OrderbookSnapshot]:
+        """
+        Subscribe to tokens and wait for their initial orderbook snapshots.
+
+        Polymarket sends a full "book" message for every asset right after
+        subscribing, so one subscription replaces a REST call per token.
+
+        Args:
+            token_ids: Token IDs to fetch
+            timeout: Max seconds to wait for all snapshots
+
+        Returns:
+            Dict of token_id -> OrderbookSnapshot for tokens that arrived in time
+        """
+        if not self.ws and not await self.connect():
+            return {}
+
+        await self.subscribe(token_ids)
+        pending = set(token_ids) - set(self.orderbooks)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            if self.running:
+                # run() owns recv(); just wait for it to fill the cache
+                await asyncio.sleep(min(0.05, remaining))
+            else:
+                try:
+                    message = await asyncio.wait_for(self.ws.recv(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                except Exception as exc:
+                    self.logger.warn(f"WebSocket snapshot interrupted: {exc}")
+                    break
+                self.messages_received += 1
+                self.last_message_time = time.time()
+                await self._handle_message(message)
+            pending.difference_update(self.orderbooks)
+
+        if pending:
+            self.logger.debug(f"No snapshot for {len(pending)} tokens after {timeout}s")
+
+        return {
+            token_id: self.orderbooks[token_id]
+            for token_id in token_ids
+            if token_id in self.orderbooks
+        }
+
     def on_book_update(self, callback: Callable):
         """
         Register callback for orderbook updates.
@@ -398,6 +490,7 @@ class PolymarketWebSocket:
     async def close(self):
         """Close WebSocket connection gracefully."""
         self.running = False
+        self.connected = False
 
         if self.ws:
             try:
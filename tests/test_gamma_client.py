@@ -137,6 +137,46 @@ class TestGammaClient:
 
         assert markets == []
 
+    @patch.object(GammaClient, "_get")
+    def test_get_markets_sends_offset(self, mock_get):
+        """get_markets only adds offset to the query when paging."""
+        mock_get.return_value = []
+
+        client = GammaClient()
+        client.get_markets(limit=10)
+        assert "offset" not in mock_get.call_args[0][1]
+
+        client.get_markets(limit=10, offset=200)
+        assert mock_get.call_args[0][1]["offset"] == 200
+
+    @patch.object(GammaClient, "get_markets")
+    def test_get_markets_paged_concatenates_pages_in_order(self, mock_get_markets):
+        """get_markets_paged splits the limit into pages and keeps offset order."""
+        mock_get_markets.side_effect = lambda limit, offset=0, **kw: [
+            {"offset": offset, "limit": limit}
+        ]
+
+        client = GammaClient()
+        markets = client.get_markets_paged(limit=250, order="volume24hr")
+
+        assert markets == [
+            {"offset": 0, "limit": 100},
+            {"offset": 100, "limit": 100},
+            {"offset": 200, "limit": 50},
+        ]
+        for call in mock_get_markets.call_args_list:
+            assert call.kwargs["order"] == "volume24hr"
+
+    @patch.object(GammaClient, "get_markets")
+    def test_get_markets_paged_single_page(self, mock_get_markets):
+        """get_markets_paged makes one plain request for small limits."""
+        mock_get_markets.return_value = []
+
+        client = GammaClient()
+        client.get_markets_paged(limit=50)
+
+        mock_get_markets.assert_called_once_with(limit=50)
+
     @patch.object(GammaClient, "get_markets")
     def test_get_top_volume_markets_filters_correctly(self, mock_get_markets):
         """get_top_volume_markets filters by volume and liquidity."""
@@ -0,0 +1,53 @@
+import pytest
+from bot.market_scanner import MarketScanner
+
+
+class DummyLogger:
+    def info(self, msg):
+        pass
+
+    def warn(self, msg):
+        pass
+
+    def debug(self, msg):
+        pass
+
+
+@pytest.fixture
+def scanner():
+    config = {
+        "market_filters": {
+            "min_volume_usd": 100.0,
+            "min_days_to_resolve": 2,
+            "max_days_to_resolve": 30,
+            "min_odds": 0.30,
+            "max_odds": 0.70,
+            "max_spread_percent": 5.0,
+        }
+    }
+    return MarketScanner(
+        client=None,
+        config=config,
+        logger=DummyLogger(),
+        position_manager=None,
+        strategy=None,
+    )
+
+
+def test_metadata_filter_reason(scanner):
+    token = "1234567890"
+    assert scanner._metadata_filter_reason(500.0, 0.0, 10, token) is None
+    assert scanner._metadata_filter_reason(50.0, 0.0, 10, token).startswith("volume_too_low")
+    assert scanner._metadata_filter_reason(500.0, 0.0, 1, token) == "days_too_soon (1 < 2)"
+    assert scanner._metadata_filter_reason(500.0, 0.0, 45, token) == "days_too_far (45 > 30)"
+    assert scanner._passes_metadata_filters(500.0, 0.0, 10, token)
+    assert not scanner._passes_metadata_filters(500.0, 0.0, 1, token)
+
+
+def test_price_filter_reason(scanner):
+    token = "1234567890"
+    assert scanner._price_filter_reason(0.50, 2.0, token, 10) is None
+    assert scanner._price_filter_reason(0.20, 2.0, token, 10).startswith("odds_out_of_range")
+    assert scanner._price_filter_reason(0.50, 8.0, token, 10).startswith("spread_too_wide")
+    assert scanner._passes_price_filters(0.50, 2.0, token, 10)
+    assert not scanner._passes_price_filters(0.50, 8.0, token, 10)
@@ -0,0 +1,89 @@
+"""
+Tests for the fill simulator's check schedule and results storage.
+"""
+
+import json
+from unittest.mock import patch
+
+from tools import simulate_fills
+from tools.simulate_fills import CheckSchedule
+
+
+class TestCheckSchedule:
+    """Tests for CheckSchedule backoff."""
+
+    def test_unchecked_tokens_are_due(self):
+        """Tokens never recorded are always due."""
+        schedule = CheckSchedule(interval=10)
+        assert schedule.due(["a", "b"], now=0.0) == ["a", "b"]
+
+    def test_near_trigger_uses_base_interval(self):
+        """A bid close to TP/SL is checked again after one interval."""
+        schedule = CheckSchedule(interval=10)
+        schedule.record("a", best_bid=0.50, tp=0.505, sl=0.40, now=100.0)
+
+        assert schedule.due(["a"], now=109.0) == []
+        assert schedule.due(["a"], now=110.0) == ["a"]
+
+    def test_far_from_trigger_backs_off(self):
+        """Distance to the nearer trigger stretches the interval."""
+        schedule = CheckSchedule(interval=10)
+        # 10% to the nearer trigger -> 5x interval
+        schedule.record("a", best_bid=0.50, tp=0.60, sl=0.45, now=100.0)
+
+        assert schedule.due(["a"], now=149.0) == []
+        assert schedule.due(["a"], now=150.0) == ["a"]
+
+    def test_backoff_is_capped(self):
+        """The interval never grows past MAX_BACKOFF."""
+        schedule = CheckSchedule(interval=10)
+        schedule.record("a", best_bid=0.10, tp=0.90, sl=0.0001, now=0.0)
+
+        assert schedule.next_check_at["a"] == 10 * CheckSchedule.MAX_BACKOFF
+
+
+class TestSimulationResults:
+    """Tests for the JSONL results file and legacy JSON history."""
+
+    def test_save_appends_lines(self, tmp_path):
+        """Each save appends one JSON record per line."""
+        results_file = tmp_path / "simulation_results.jsonl"
+        with patch.object(simulate_fills, "RESULTS_FILE", results_file):
+            simulate_fills.save_simulation_results([{"id": 1}])
+            simulate_fills.save_simulation_results([{"id": 2}, {"id": 3}])
+
+        lines = results_file.read_text().splitlines()
+        assert [json.loads(line) for line in lines] == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+    def test_load_reads_legacy_history_first(self, tmp_path):
+        """Legacy JSON records come before JSONL records."""
+        legacy_file = tmp_path / "simulation_results.json"
+        results_file = tmp_path / "simulation_results.jsonl"
+        legacy_file.write_text(json.dumps([{"id": 1}, {"id": 2}]))
+        results_file.write_text('{"id": 3}\n\n{"id": 4}\n')
+
+        with patch.object(simulate_fills, "LEGACY_RESULTS_FILE", legacy_file), \
+                patch.object(simulate_fills, "RESULTS_FILE", results_file):
+            results = simulate_fills.load_simulation_results()
+
+        assert [r["id"] for r in results] == [1, 2, 3, 4]
+
+    def test_load_without_files_is_empty(self, tmp_path):
+        """No history yields an empty list."""
+        with patch.object(simulate_fills, "LEGACY_RESULTS_FILE", tmp_path / "a.json"), \
+                patch.object(simulate_fills, "RESULTS_FILE", tmp_path / "b.jsonl"):
+            assert simulate_fills.load_simulation_results() == []
+
+    def test_save_leaves_legacy_file_untouched(self, tmp_path):
+        """New results never rewrite the legacy JSON array."""
+        legacy_file = tmp_path / "simulation_results.json"
+        results_file = tmp_path / "simulation_results.jsonl"
+        legacy_file.write_text(json.dumps([{"id": 1}]))
+
+        with patch.object(simulate_fills, "LEGACY_RESULTS_FILE", legacy_file), \
+                patch.object(simulate_fills, "RESULTS_FILE", results_file):
+            simulate_fills.save_simulation_results([{"id": 2}])
+            results = simulate_fills.load_simulation_results()
+
+        assert json.loads(legacy_file.read_text()) == [{"id": 1}]
+        assert [r["id"] for r in results] == [1, 2]
@@ -331,6 +331,156 @@ def test_callback_registration():
     return True
 
 
+def test_collect_snapshots():
+    """Test collecting initial snapshots keyed by asset_id."""
+    import asyncio
+    from bot.websocket_client import PolymarketWebSocket
+
+    class MockLogger:
+        def info(self, msg):
+            pass
+
+        def warn(self, msg):
+            pass
+
+        def error(self, msg):
+            pass
+
+        def debug(self, msg):
+            pass
+
+    class MockConnection:
+        def __init__(self, messages):
+            self.messages = list(messages)
+            self.sent = []
+
+        async def send(self, message):
+            self.sent.append(json.loads(message))
+
+        async def recv(self):
+            if not self.messages:
+                await asyncio.sleep(3600)
+            return self.messages.pop(0)
+
+    books = [
+        {
+            "event_type": "book",
+            "asset_id": token_id,
+            "market": "0xcondition",
+            "bids": [{"price": "0.40", "size": "10"}],
+            "asks": [{"price": ask, "size": "10"}],
+        }
+        for token_id, ask in (("token_a", "0.45"), ("token_b", "0.57"))
+    ]
+
+    ws = PolymarketWebSocket(MockLogger())
+    ws.ws = MockConnection([json.dumps(books)])
+
+    snapshots = asyncio.run(
+        ws.collect_snapshots(["token_a", "token_b", "token_c"], timeout=0.2)
+    )
+
+    assert ws.ws.sent[0]["assets_ids"] == ["token_a", "token_b", "token_c"]
+    assert set(snapshots) == {"token_a", "token_b"}, "Missing tokens are omitted"
+    assert snapshots["token_a"].best_ask == 0.45
+    assert snapshots["token_b"].best_ask == 0.57
+
+    print("✓ Snapshot collection works correctly")
+    return True
+
+
+def test_price_change_updates_levels():
+    """Test price_change deltas update cached orderbook levels."""
+    import asyncio
+    from bot.websocket_client import PolymarketWebSocket, OrderbookSnapshot
+
+    class MockLogger:
+        def info(self, msg):
+            pass
+
+        def warn(self, msg):
+            pass
+
+        def error(self, msg):
+            pass
+
+        def debug(self, msg):
+            pass
+
+    ws = PolymarketWebSocket(MockLogger())
+    ws.orderbooks["token_a"] = OrderbookSnapshot(
+        token_id="token_a", timestamp=0, bids=[(0.48, 100)], asks=[(0.52, 100), (0.53, 50)]
+    )
+
+    # Current format: list of changes tagged with asset_id
+    asyncio.run(ws._process_message_dict({
+        "event_type": "price_change",
+        "market": "0xcondition",
+        "price_changes": [
+            {"asset_id": "token_a", "price": "0.52", "size": "0", "side": "SELL"},
+            {"asset_id": "token_a", "price": "0.49", "size": "20", "side": "BUY"},
+            {"asset_id": "unknown", "price": "0.10", "size": "5", "side": "BUY"},
+        ],
+    }))
+    snapshot = ws.orderbooks["token_a"]
+    assert snapshot.best_ask == 0.53, "Zero size should remove the level"
+    assert snapshot.best_bid == 0.49, "New level should be added"
+    assert snapshot.timestamp > 0
+    assert "unknown" not in ws.orderbooks
+
+    # Older format: one asset per message
+    asyncio.run(ws._process_message_dict({
+        "event_type": "price_change",
+        "asset_id": "token_a",
+        "changes": [{"price": "0.53", "size": "75", "side": "SELL"}],
+    }))
+    assert (0.53, 75.0) in snapshot.asks
+    assert len(snapshot.asks) == 1, "Size replaces the existing level"
+
+    print("✓ Price change deltas work correctly")
+    return True
+
+
+def test_disconnect_drops_cached_books():
+    """Test a closed connection clears cached books and the connected flag."""
+    import asyncio
+    import websockets
+    from bot.websocket_client import PolymarketWebSocket, OrderbookSnapshot
+
+    class MockLogger:
+        def info(self, msg):
+            pass
+
+        def warn(self, msg):
+            pass
+
+        def error(self, msg):
+            pass
+
+        def debug(self, msg):
+            pass
+
+    class ClosedConnection:
+        async def recv(self):
+            raise websockets.ConnectionClosed(None, None)
+
+    ws = PolymarketWebSocket(MockLogger())
+    ws.ws = ClosedConnection()
+    ws.connected = True
+    ws.orderbooks["token_a"] = OrderbookSnapshot(
+        token_id="token_a", timestamp=0, bids=[(0.48, 100)], asks=[(0.52, 100)]
+    )
+
+    asyncio.run(ws.run(auto_reconnect=False))
+
+    assert ws.orderbooks == {}, "Books must not outlive the connection"
+    assert ws.connected is False
+    assert ws.running is False, "run() should clear running when it exits"
+
+    print("✓ Disconnect drops cached books")
+    return True
+
+
 def run_all_tests():
     """Run all unit tests."""
     tests = [
@@ -342,6 +492,9 @@ def run_all_tests():
         ("Get cached orderbook", test_get_orderbook),
         ("Statistics tracking", test_stats),
         ("Callback registration", test_callback_registration),
+        ("Collect snapshots", test_collect_snapshots),
+        ("Price change deltas", test_price_change_updates_levels),
+        ("Disconnect drops cached books", test_disconnect_drops_cached_books),
     ]
 
     print("=" * 60)
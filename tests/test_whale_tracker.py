@@ -0,0 +1,174 @@
+"""
+Tests for the WhaleTracker trades cache and incremental leaderboard.
+"""
+
+from unittest.mock import Mock, patch
+
+from tools.whale_tracker import WhaleTracker
+
+
+def _response(status_code=200, trades=None, etag=None):
+    resp = Mock()
+    resp.status_code = status_code
+    resp.json.return_value = trades if trades is not None else []
+    resp.headers = {"ETag": etag} if etag else {}
+    return resp
+
+
+def _trade(tx, wallet="0xA", asset="tok1", ts=100, size=10, price=0.5, side="BUY"):
+    return {
+        "transactionHash": tx,
+        "proxyWallet": wallet,
+        "asset": asset,
+        "timestamp": ts,
+        "size": size,
+        "price": price,
+        "side": side,
+        "conditionId": "cond1",
+    }
+
+
+def _tracker():
+    tracker = WhaleTracker(verbose=False)
+    tracker.session = Mock()
+    return tracker
+
+
+class TestTradesCache:
+    """Tests for the get_recent_trades response cache."""
+
+    def test_repeat_call_within_ttl_skips_request(self):
+        """A second call inside TRADES_CACHE_TTL is served from memory."""
+        tracker = _tracker()
+        tracker.session.get.return_value = _response(trades=[_trade("0x1")])
+
+        first = tracker.get_recent_trades(limit=50)
+        second = tracker.get_recent_trades(limit=50)
+
+        assert first == second == [_trade("0x1")]
+        assert tracker.session.get.call_count == 1
+
+    def test_cache_is_keyed_on_limit_and_offset(self):
+        """Different pages are fetched separately."""
+        tracker = _tracker()
+        tracker.session.get.return_value = _response(trades=[])
+
+        tracker.get_recent_trades(limit=50)
+        tracker.get_recent_trades(limit=50, offset=50)
+
+        assert tracker.session.get.call_count == 2
+
+    def test_expired_entry_revalidates_with_etag(self):
+        """After the TTL, the stored ETag is sent as If-None-Match."""
+        tracker = _tracker()
+        tracker.session.get.return_value = _response(trades=[_trade("0x1")], etag='"v1"')
+
+        with patch("tools.whale_tracker.time.monotonic", return_value=1000.0):
+            tracker.get_recent_trades(limit=50)
+        with patch("tools.whale_tracker.time.monotonic", return_value=1010.0):
+            tracker.get_recent_trades(limit=50)
+
+        headers = tracker.session.get.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+
+    def test_not_modified_reuses_cached_rows(self):
+        """A 304 returns the cached trades and refreshes the TTL."""
+        tracker = _tracker()
+        tracker.session.get.return_value = _response(trades=[_trade("0x1")], etag='"v1"')
+        with patch("tools.whale_tracker.time.monotonic", return_value=1000.0):
+            tracker.get_recent_trades(limit=50)
+
+        tracker.session.get.return_value = _response(status_code=304)
+        with patch("tools.whale_tracker.time.monotonic", return_value=1010.0):
+            trades = tracker.get_recent_trades(limit=50)
+        with patch("tools.whale_tracker.time.monotonic", return_value=1012.0):
+            again = tracker.get_recent_trades(limit=50)
+
+        assert trades == again == [_trade("0x1")]
+        assert tracker.session.get.call_count == 2
+
+    def test_error_status_returns_empty_list(self):
+        """Non-200/304 responses yield no trades and are not cached."""
+        tracker = _tracker()
+        tracker.session.get.return_value = _response(status_code=500)
+
+        assert tracker.get_recent_trades(limit=50) == []
+        assert tracker._trades_cache == {}
+
+    def test_returned_list_is_not_the_cached_list(self):
+        """Mutating a returned list does not change later results."""
+        tracker = _tracker()
+        tracker.session.get.return_value = _response(trades=[_trade("0x1")])
+
+        first = tracker.get_recent_trades(limit=50)
+        first.append(_trade("0x2"))
+        first.sort(key=lambda t: t["transactionHash"], reverse=True)
+
+        assert tracker.get_recent_trades(limit=50) == [_trade("0x1")]
+
+
+class TestIncrementalLeaderboard:
+    """Tests for the build_leaderboard trade cursor."""
+
+    def test_repeated_trades_are_counted_once(self):
+        """Feeding the same window twice does not double the stats."""
+        tracker = _tracker()
+        trades = [_trade("0x1", ts=100), _trade("0x2", ts=101)]
+
+        tracker.build_leaderboard(trades)
+        board = tracker.build_leaderboard(trades)
+
+        assert board[0]["trade_count"] == 2
+        assert board[0]["total_volume"] == 10.0
+
+    def test_only_newer_trades_are_folded_in(self):
+        """A later window adds just the trades past the cursor."""
+        tracker = _tracker()
+        tracker.build_leaderboard([_trade("0x1", ts=100)])
+
+        board = tracker.build_leaderboard([_trade("0x2", ts=105), _trade("0x1", ts=100)])
+
+        assert board[0]["trade_count"] == 2
+
+    def test_ties_at_cursor_timestamp_across_polls(self):
+        """A trade sharing the newest timestamp still counts on a later poll."""
+        tracker = _tracker()
+        tracker.build_leaderboard([_trade("0x1", ts=100)])
+
+        board = tracker.build_leaderboard([_trade("0x1", ts=100), _trade("0x2", ts=100)])
+
+        assert board[0]["trade_count"] == 2
+
+    def test_rows_from_one_transaction_are_distinct(self):
+        """Rows for other wallets or assets in the same tx are not dropped."""
+        tracker = _tracker()
+        tracker.build_leaderboard([_trade("0x1", wallet="0xA", ts=100)])
+
+        board = tracker.build_leaderboard([
+            _trade("0x1", wallet="0xA", ts=100),
+            _trade("0x1", wallet="0xB", ts=100),
+            _trade("0x1", wallet="0xA", asset="tok2", ts=100),
+        ])
+
+        counts = {row["wallet"]: row["trade_count"] for row in board}
+        assert counts == {"0xA": 2, "0xB": 1}
+
+    def test_untimed_rows_are_counted_once(self):
+        """Rows without a timestamp are remembered by identity."""
+        tracker = _tracker()
+        row = _trade("0x9", ts=None)
+
+        tracker.build_leaderboard([row])
+        board = tracker.build_leaderboard([row])
+
+        assert board[0]["trade_count"] == 1
+
+    def test_non_incremental_recomputes(self):
+        """incremental=False resets stats and the cursor."""
+        tracker = _tracker()
+        trades = [_trade("0x1", ts=100)]
+        tracker.build_leaderboard(trades)
+
+        board = tracker.build_leaderboard(trades, incremental=False)
+
+        assert board[0]["trade_count"] == 1
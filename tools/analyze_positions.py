@@ -15,6 +15,8 @@ import json
 import os
 import sys
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 
 from dotenv import load_dotenv
 
@@ -24,30 +26,53 @@ load_dotenv()
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from py_clob_client.client import ClobClient
-from py_clob_client.clob_types import ApiCreds
+from py_clob_client.clob_types import ApiCreds, BookParams
 
 POLYMARKET_HOST = "https://clob.polymarket.com"
 CHAIN_ID = 137
 
+_SEP = "=" * 110
+_DASH = "-" * 110
+
+
+@lru_cache(maxsize=1)
+def _get_api_creds(private_key):
+    """Return API creds from .env, deriving them (one round-trip) only if missing."""
+    api_key = os.getenv("POLY_API_KEY", "").strip()
+    api_secret = os.getenv("POLY_API_SECRET", "").strip()
+    api_passphrase = os.getenv("POLY_API_PASSPHRASE", "").strip()
+    if api_key and api_secret and api_passphrase:
+        return ApiCreds(
+            api_key=api_key,
+            api_secret=api_secret,
+            api_passphrase=api_passphrase,
+        )
+
+    derived = ClobClient(POLYMARKET_HOST, key=private_key, chain_id=CHAIN_ID).derive_api_key()
+    return ApiCreds(
+        api_key=derived.api_key,
+        api_secret=derived.api_secret,
+        api_passphrase=derived.api_passphrase,
+    )
+
 
 def create_client():
-    """Create CLOB client for fetching live prices."""
-    private_key = os.getenv("POLY_PRIVATE_KEY")
+    """Create CLOB client for fetching live prices.
+
+    One client is built per run and reused for every price fetch;
+    py_clob_client sends all requests through a shared keep-alive
+    HTTP/2 connection pool, so no per-call handshake is paid.
+    """
+    private_key = os.getenv("POLY_PRIVATE_KEY", "").strip()
     if not private_key:
         return None
     
     try:
-        creds = ClobClient(POLYMARKET_HOST, key=private_key, chain_id=CHAIN_ID)
-        api_creds = creds.derive_api_key()
         return ClobClient(
             POLYMARKET_HOST,
             key=private_key,
             chain_id=CHAIN_ID,
-            creds=ApiCreds(
-                api_key=api_creds.api_key,
-                api_secret=api_creds.api_secret,
-                api_passphrase=api_creds.api_passphrase,
-            ),
+            creds=_get_api_creds(private_key),
             signature_type=1,
             funder=os.getenv("POLY_FUNDER_ADDRESS"),
         )
@@ -64,13 +89,37 @@ def get_live_price(client, token_id):
     try:
         book = client.get_order_book(token_id)
         if book and book.bids:
-            prices = [float(b.price) for b in book.bids]
-            return max(prices) if prices else None
+            # Bids are not guaranteed to be sorted best-first, so scan them
+            return max((float(b.price) for b in book.bids), default=None)
     except Exception:
         pass
     return None
 
 
+def get_live_prices(client, token_ids):
+    """Get current best bid for many tokens with a single /books request.
+
+    Tokens missing from the batch response (or all of them, if the batch
+    call fails) are fetched with one request per token.
+    """
+    if not client or not token_ids:
+        return {}
+    
+    prices = {}
+    try:
+        books = client.get_order_books([BookParams(token_id=t) for t in token_ids])
+        for book in books:
+            if book:
+                prices[book.asset_id] = max((float(b.price) for b in book.bids or ()), default=None)
+    except Exception:
+        pass
+    
+    for token_id in token_ids:
+        if token_id not in prices:
+            prices[token_id] = get_live_price(client, token_id)
+    return prices
+
+
 def calculate_metrics(entry_price, tp, sl, current_price=None):
     """Calculate position metrics with optional live price."""
     if current_price is None:
@@ -120,6 +169,9 @@ def analyze_positions(filepath='data/positions.json', use_live=True):
     elif use_live:
         print("⚠️  Could not connect to API, using entry prices")
     
+    # Fetch every live price up front so the metrics pass is pure arithmetic
+    live_prices = get_live_prices(client, list(positions))
+    
     analyzed = []
     
     for token_id, pos in positions.items():
@@ -129,9 +181,7 @@ def analyze_positions(filepath='data/positions.json', use_live=True):
         size = pos.get('filled_size', pos['size'])
         entry_time = pos['entry_time']
         
-        # Get live price if available
-        live_price = get_live_price(client, token_id) if client else None
-        metrics = calculate_metrics(entry, tp, sl, live_price)
+        metrics = calculate_metrics(entry, tp, sl, live_prices.get(token_id))
         
         analyzed.append({
             'token_id': token_id[:16] + '...',
@@ -150,44 +200,52 @@ def analyze_positions(filepath='data/positions.json', use_live=True):
 def format_output(positions, show_live=True):
     """Format and display position analysis."""
     print()
-    print("=" * 110)
+    print(_SEP)
     print("📊 POSITION ANALYSIS REPORT" + (" (LIVE PRICES)" if show_live else ""))
-    print(f"   Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 110)
+    print(f"   Generated: {datetime.now():%Y-%m-%d %H:%M:%S}")
+    print(_SEP)
     
     if not positions:
         print("No positions found.")
         return
     
-    # Count live vs static
-    live_count = sum(1 for p in positions if p.get('is_live', False))
+    # Aggregate counts, P&L and extremes in a single pass
+    live_count = 0
+    total_pnl = 0.0
+    winning = 0
+    losing = 0
+    closest_to_tp = closest_to_sl = positions[0]
+    for p in positions:
+        if p.get('is_live', False):
+            live_count += 1
+        total_pnl += p['pnl'] * p['size']
+        if p['pnl'] > 0:
+            winning += 1
+        elif p['pnl'] < 0:
+            losing += 1
+        if abs(p['pct_to_tp']) < abs(closest_to_tp['pct_to_tp']):
+            closest_to_tp = p
+        if abs(p['pct_to_sl']) < abs(closest_to_sl['pct_to_sl']):
+            closest_to_sl = p
+    
     print(f"   Positions: {len(positions)} | Live prices: {live_count}/{len(positions)}")
     print()
     
-    # Summary: Total P&L
-    total_pnl = sum(p['pnl'] * p['size'] for p in positions)
-    winning = [p for p in positions if p['pnl'] > 0]
-    losing = [p for p in positions if p['pnl'] < 0]
-    
     print(f"   💰 Unrealized P&L: ${total_pnl:.4f}")
-    print(f"   📈 Winning: {len(winning)} | 📉 Losing: {len(losing)}")
+    print(f"   📈 Winning: {winning} | 📉 Losing: {losing}")
     print()
     
-    # Find extremes
-    if positions:
-        closest_to_tp = min(positions, key=lambda x: abs(x['pct_to_tp']))
-        closest_to_sl = min(positions, key=lambda x: abs(x['pct_to_sl']))
-        print(f"   🎯 Closest to TP: {closest_to_tp['token_id']} ({closest_to_tp['pct_to_tp']:+.1f}%)")
-        print(f"   ⚠️  Closest to SL: {closest_to_sl['token_id']} ({closest_to_sl['pct_to_sl']:+.1f}%)")
+    print(f"   🎯 Closest to TP: {closest_to_tp['token_id']} ({closest_to_tp['pct_to_tp']:+.1f}%)")
+    print(f"   ⚠️  Closest to SL: {closest_to_sl['token_id']} ({closest_to_sl['pct_to_sl']:+.1f}%)")
     
     print()
-    print("-" * 110)
+    print(_DASH)
     header = f"{'Token':<19} {'Entry':>6} {'Now':>6} {'TP':>6} {'SL':>6} {'P&L':>8} {'→TP':>7} {'→SL':>7} {'Status'}"
     print(header)
-    print("-" * 110)
+    print(_DASH)
     
     # Sort by P&L descending
-    for p in sorted(positions, key=lambda x: x['pnl_pct'], reverse=True):
+    for p in sorted(positions, key=itemgetter('pnl_pct'), reverse=True):
         # Status flags
         status = ""
         if p['pct_to_tp'] <= 3:
@@ -215,10 +273,10 @@ def format_output(positions, show_live=True):
               f"{p['pct_to_sl']:>+6.1f}% "
               f"{status}")
     
-    print("-" * 110)
+    print(_DASH)
     print()
     print("Legend: ● = Live price | ○ = Entry price (API unavailable)")
-    print("=" * 110)
+    print(_SEP)
 
 
 def main():
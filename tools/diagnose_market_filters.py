@@ -11,12 +11,15 @@ Usage:
     python tools/diagnose_market_filters.py --csv       # Export to CSV
 """
 
+import csv
 import json
 import os
 import sys
+from collections import Counter
+from operator import itemgetter
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import List
 
 # Add parent to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -33,17 +36,28 @@ from bot.strategy import TradingStrategy
 class SimpleLogger:
     """Minimal logger for diagnostic tool."""
 
+    def __init__(self):
+        # When set, lines are appended here instead of printed, so they stay
+        # in order with the report being built for the current market
+        self.sink = None
+
+    def _emit(self, line):
+        if self.sink is not None:
+            self.sink.append(line + "\n")
+        else:
+            print(line)
+
     def info(self, msg):
-        print(f"[INFO] {msg}")
+        self._emit(f"[INFO] {msg}")
 
     def warn(self, msg):
-        print(f"[WARN] {msg}")
+        self._emit(f"[WARN] {msg}")
 
     def debug(self, msg):
         pass  # Suppress debug in diagnostic mode
 
     def error(self, msg):
-        print(f"[ERROR] {msg}")
+        self._emit(f"[ERROR] {msg}")
 
 
 def load_config():
@@ -67,6 +81,131 @@ def init_client():
     return ClobClient(host=host, chain_id=chain_id, key=private_key)
 
 
+def _analyze_market(i, total, market, scanner, strategy, out):
+    """Run one market through the scanner filters, appending its report lines to out."""
+    out.append(f"\n[{i+1}/{total}] Analyzing market...\n")
+
+    # Get question
+    question = market.get("question") or market.get("title") or "Unknown"
+    out.append(f"  Question: {question[:70]}\n")
+
+    # Check if closed
+    closed, reason = scanner._is_closed(market)
+    status = market.get("status", "N/A")
+    active = market.get("active", "N/A")
+    closed_flag = market.get("closed", "N/A")
+
+    out.append(f"  Status: {status} | Active: {active} | Closed: {closed_flag}\n")
+
+    if closed:
+        out.append(f"  ❌ REJECTED: {reason}\n")
+        return {
+            "question": question,
+            "reason": reason,
+            "status": status,
+            "active": active,
+            "closed": closed_flag,
+            "days_to_resolve": scanner._days_to_resolve(market),
+            "accepted": False
+        }
+
+    # Check metadata filters
+    token_candidates = scanner._extract_token_candidates(market)
+    if not token_candidates:
+        out.append(f"  ❌ REJECTED: missing_token\n")
+        return {
+            "question": question,
+            "reason": "missing_token",
+            "accepted": False
+        }
+
+    token_id = token_candidates[0]
+    short_id = token_id[:8]
+    volume_usd = scanner._extract_volume_usd(market)
+    liquidity = scanner._extract_liquidity(market)
+    days_to_resolve = scanner._days_to_resolve(market)
+
+    out.append(f"  Token: {short_id}...\n")
+    out.append(f"  Volume: ${volume_usd:.2f} | Liquidity: ${liquidity:.2f}\n")
+    out.append(f"  Days to resolve: {days_to_resolve}\n")
+
+    # Apply metadata filters
+    reason = scanner._metadata_filter_reason(volume_usd, liquidity, days_to_resolve, token_id)
+    if reason:
+        out.append(f"  ❌ REJECTED: {reason}\n")
+        return {
+            "question": question,
+            "reason": reason,
+            "token_id": short_id,
+            "volume_usd": volume_usd,
+            "liquidity": liquidity,
+            "days_to_resolve": days_to_resolve,
+            "accepted": False
+        }
+
+    # Get orderbook
+    try:
+        best_bid, best_ask = scanner._get_best_prices(token_id)
+    except Exception as e:
+        out.append(f"  ❌ REJECTED: no_orderbook ({e})\n")
+        return {
+            "question": question,
+            "reason": "no_orderbook",
+            "token_id": short_id,
+            "accepted": False
+        }
+
+    if best_bid <= 0 or best_ask <= 0:
+        out.append(f"  ❌ REJECTED: no_orderbook (bid={best_bid} ask={best_ask})\n")
+        return {
+            "question": question,
+            "reason": "no_orderbook",
+            "token_id": short_id,
+            "bid": best_bid,
+            "ask": best_ask,
+            "accepted": False
+        }
+
+    odds = (best_bid + best_ask) / 2
+    spread_percent = scanner._spread_percent(best_bid, best_ask)
+
+    out.append(f"  Bid: {best_bid:.4f} | Ask: {best_ask:.4f} | Odds: {odds:.4f}\n")
+    out.append(f"  Spread: {spread_percent:.2f}%\n")
+
+    # Apply price filters
+    reason = scanner._price_filter_reason(odds, spread_percent, token_id, days_to_resolve)
+    if reason:
+        out.append(f"  ❌ REJECTED: {reason}\n")
+        return {
+            "question": question,
+            "reason": reason,
+            "token_id": short_id,
+            "odds": odds,
+            "spread_percent": spread_percent,
+            "accepted": False
+        }
+
+    # ACCEPTED
+    score = strategy.calculate_market_score(
+        spread_percent=spread_percent,
+        volume_usd=volume_usd,
+        odds=odds,
+        days_to_resolve=days_to_resolve,
+    )
+
+    out.append(f"  ✅ ACCEPTED: score={score:.1f}\n")
+    return {
+        "question": question,
+        "token_id": short_id,
+        "odds": odds,
+        "spread_percent": spread_percent,
+        "volume_usd": volume_usd,
+        "days_to_resolve": days_to_resolve,
+        "score": score,
+        "accepted": True
+    }
+
+
 def diagnose_markets(show_all: bool = False, export_csv: bool = False):
     """
     Run market scanner and show detailed rejection reasons.
@@ -108,163 +247,14 @@ def diagnose_markets(show_all: bool = False, export_csv: bool = False):
 
     # Analyze each market
     results = []
-    rejection_counts: Dict[str, int] = {}
 
     for i, market in enumerate(markets):
-        print(f"\n[{i+1}/{len(markets)}] Analyzing market...")
-
-        # Get question
-        question = market.get("question") or market.get("title") or "Unknown"
-        print(f"  Question: {question[:70]}")
-
-        # Check if closed
-        closed, reason = scanner._is_closed(market)
-        status = market.get("status", "N/A")
-        active = market.get("active", "N/A")
-        closed_flag = market.get("closed", "N/A")
-
-        print(f"  Status: {status} | Active: {active} | Closed: {closed_flag}")
-
-        if closed:
-            print(f"  ❌ REJECTED: {reason}")
-            rejection_counts[reason] = rejection_counts.get(reason, 0) + 1
-            results.append({
-                "question": question,
-                "reason": reason,
-                "status": status,
-                "active": active,
-                "closed": closed_flag,
-                "days_to_resolve": scanner._days_to_resolve(market),
-                "accepted": False
-            })
-            continue
-
-        # Check metadata filters
-        token_candidates = scanner._extract_token_candidates(market)
-        if not token_candidates:
-            print(f"  ❌ REJECTED: missing_token")
-            rejection_counts["missing_token"] = rejection_counts.get("missing_token", 0) + 1
-            results.append({
-                "question": question,
-                "reason": "missing_token",
-                "accepted": False
-            })
-            continue
-
-        token_id = token_candidates[0]
-        volume_usd = scanner._extract_volume_usd(market)
-        liquidity = scanner._extract_liquidity(market)
-        days_to_resolve = scanner._days_to_resolve(market)
-
-        print(f"  Token: {token_id[:8]}...")
-        print(f"  Volume: ${volume_usd:.2f} | Liquidity: ${liquidity:.2f}")
-        print(f"  Days to resolve: {days_to_resolve}")
-
-        # Apply metadata filters
-        if not scanner._passes_metadata_filters(volume_usd, liquidity, days_to_resolve, token_id):
-            filters = config.get("market_filters", {})
-            min_days = filters.get("min_days_to_resolve", 2)
-            max_days = filters.get("max_days_to_resolve", 30)
-
-            # Determine specific reason
-            if days_to_resolve < min_days:
-                reason = f"days_too_soon ({days_to_resolve} < {min_days})"
-            elif days_to_resolve > max_days:
-                reason = f"days_too_far ({days_to_resolve} > {max_days})"
-            else:
-                reason = "metadata_filtered"
-
-            print(f"  ❌ REJECTED: {reason}")
-            rejection_counts[reason] = rejection_counts.get(reason, 0) + 1
-            results.append({
-                "question": question,
-                "reason": reason,
-                "token_id": token_id[:8],
-                "volume_usd": volume_usd,
-                "liquidity": liquidity,
-                "days_to_resolve": days_to_resolve,
-                "accepted": False
-            })
-            continue
-
-        # Get orderbook
-        try:
-            best_bid, best_ask = scanner._get_best_prices(token_id)
-        except Exception as e:
-            print(f"  ❌ REJECTED: no_orderbook ({e})")
-            rejection_counts["no_orderbook"] = rejection_counts.get("no_orderbook", 0) + 1
-            results.append({
-                "question": question,
-                "reason": "no_orderbook",
-                "token_id": token_id[:8],
-                "accepted": False
-            })
-            continue
-
-        if best_bid <= 0 or best_ask <= 0:
-            print(f"  ❌ REJECTED: no_orderbook (bid={best_bid} ask={best_ask})")
-            rejection_counts["no_orderbook"] = rejection_counts.get("no_orderbook", 0) + 1
-            results.append({
-                "question": question,
-                "reason": "no_orderbook",
-                "token_id": token_id[:8],
-                "bid": best_bid,
-                "ask": best_ask,
-                "accepted": False
-            })
-            continue
-
-        odds = (best_bid + best_ask) / 2
-        spread_percent = scanner._spread_percent(best_bid, best_ask)
-
-        print(f"  Bid: {best_bid:.4f} | Ask: {best_ask:.4f} | Odds: {odds:.4f}")
-        print(f"  Spread: {spread_percent:.2f}%")
-
-        # Apply price filters
-        if not scanner._passes_price_filters(odds, spread_percent, token_id, days_to_resolve):
-            filters = config.get("market_filters", {})
-            min_odds = filters.get("min_odds", 0.30)
-            max_odds = filters.get("max_odds", 0.70)
-            max_spread = filters.get("max_spread_percent", 5.0)
-
-            if not (min_odds <= odds <= max_odds):
-                reason = f"odds_out_of_range ({odds:.2f} not in [{min_odds}, {max_odds}])"
-            elif spread_percent > max_spread:
-                reason = f"spread_too_wide ({spread_percent:.2f}% > {max_spread}%)"
-            else:
-                reason = "price_filtered"
-
-            print(f"  ❌ REJECTED: {reason}")
-            rejection_counts[reason] = rejection_counts.get(reason, 0) + 1
-            results.append({
-                "question": question,
-                "reason": reason,
-                "token_id": token_id[:8],
-                "odds": odds,
-                "spread_percent": spread_percent,
-                "accepted": False
-            })
-            continue
-
-        # ACCEPTED
-        score = strategy.calculate_market_score(
-            spread_percent=spread_percent,
-            volume_usd=volume_usd,
-            odds=odds,
-            days_to_resolve=days_to_resolve,
-        )
-
-        print(f"  ✅ ACCEPTED: score={score:.1f}")
-        results.append({
-            "question": question,
-            "token_id": token_id[:8],
-            "odds": odds,
-            "spread_percent": spread_percent,
-            "volume_usd": volume_usd,
-            "days_to_resolve": days_to_resolve,
-            "score": score,
-            "accepted": True
-        })
+        # Each market's report, scanner log lines included, goes out in one write
+        out = []
+        logger.sink = out
+        results.append(_analyze_market(i, len(markets), market, scanner, strategy, out))
+        logger.sink = None
+        sys.stdout.write("".join(out))
 
     # Print summary
     print("\n" + "=" * 80)
@@ -272,8 +262,10 @@ def diagnose_markets(show_all: bool = False, export_csv: bool = False):
     print("=" * 80)
     print()
 
-    accepted = [r for r in results if r["accepted"]]
-    rejected = [r for r in results if not r["accepted"]]
+    accepted, rejected = [], []
+    for r in results:
+        (accepted if r["accepted"] else rejected).append(r)
+    rejection_counts = Counter(r["reason"] for r in rejected)
 
     print(f"Total markets analyzed: {len(results)}")
     print(f"✅ Accepted: {len(accepted)}")
@@ -282,7 +274,7 @@ def diagnose_markets(show_all: bool = False, export_csv: bool = False):
 
     if rejection_counts:
         print("Rejection reasons:")
-        for reason, count in sorted(rejection_counts.items(), key=lambda x: x[1], reverse=True):
+        for reason, count in rejection_counts.most_common():
             print(f"  • {reason}: {count}")
 
     print()
@@ -294,28 +286,34 @@ def diagnose_markets(show_all: bool = False, export_csv: bool = False):
         print("=" * 80)
         print()
 
-        accepted.sort(key=lambda x: x.get("score", 0), reverse=True)
+        accepted.sort(key=itemgetter("score"), reverse=True)
         for i, market in enumerate(accepted[:10]):
             print(f"{i+1}. {market['question'][:60]}")
             print(f"   Token: {market['token_id']}... | Odds: {market['odds']:.2f} | "
                   f"Spread: {market['spread_percent']:.1f}% | Days: {market['days_to_resolve']} | "
-                  f"Score: {market.get('score', 0):.1f}")
+                  f"Score: {market['score']:.1f}")
             print()
 
     # Export to CSV if requested
     if export_csv:
         csv_file = Path(__file__).parent.parent / "data" / "market_diagnostic.csv"
-        with open(csv_file, 'w') as f:
-            f.write("Question,Token ID,Accepted,Reason,Odds,Spread %,Days to Resolve,Score\n")
-            for r in results:
-                f.write(f'"{r["question"]}",')
-                f.write(f'{r.get("token_id", "N/A")},')
-                f.write(f'{r["accepted"]},')
-                f.write(f'{r.get("reason", "ok")},')
-                f.write(f'{r.get("odds", 0):.4f},')
-                f.write(f'{r.get("spread_percent", 0):.2f},')
-                f.write(f'{r.get("days_to_resolve", 0)},')
-                f.write(f'{r.get("score", 0):.2f}\n')
+        with open(csv_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Question", "Token ID", "Accepted", "Reason", "Odds",
+                             "Spread %", "Days to Resolve", "Score"])
+            writer.writerows(
+                (
+                    r["question"],
+                    r.get("token_id", "N/A"),
+                    r["accepted"],
+                    r.get("reason", "ok"),
+                    f'{r.get("odds", 0):.4f}',
+                    f'{r.get("spread_percent", 0):.2f}',
+                    r.get("days_to_resolve", 0),
+                    f'{r.get("score", 0):.2f}',
+                )
+                for r in results
+            )
 
         print(f"Results exported to: {csv_file}")
 
@@ -12,13 +12,21 @@ Usage:
     python dutch_book_scanner.py --min-profit 0.02  # Min 2% profit
     python dutch_book_scanner.py --exclude-crypto   # Skip crypto markets
     python dutch_book_scanner.py --once       # Single scan, then exit
+    python dutch_book_scanner.py --websocket  # Order books via WebSocket snapshots
 """
 
 import argparse
+import asyncio
+import heapq
 import os
+import re
+import signal
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from operator import itemgetter
 from typing import Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
@@ -27,15 +35,23 @@ from dotenv import load_dotenv
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from py_clob_client.client import ClobClient
-from py_clob_client.clob_types import ApiCreds
+from py_clob_client.clob_types import ApiCreds, BookParams
 
 from bot.gamma_client import GammaClient
+from bot.websocket_client import OrderbookSnapshot, PolymarketWebSocket
 
 # Polymarket fee structure (approximate)
 # Non-crypto markets typically have lower effective fees
 TAKER_FEE = 0.01  # 1% taker fee
 MIN_PROFIT_AFTER_FEES = 0.015  # 1.5% minimum profit to cover fees + slippage
 
+# Tokens per /books request
+BOOKS_BATCH_SIZE = 50
+
+# Streamed books are only trusted while the socket has delivered a message
+# this recently (seconds); otherwise the scan prices from REST
+WS_MAX_SILENCE = 30.0
+
 # Crypto market keywords (higher fees, more competitive)
 CRYPTO_KEYWORDS = [
     "bitcoin", "btc", "ethereum", "eth", "solana", "sol",
@@ -44,10 +60,46 @@ CRYPTO_KEYWORDS = [
 ]
 
 
+# All keywords in one pattern: a single scan of the question instead of one per keyword
+_CRYPTO_RE = re.compile("|".join(map(re.escape, CRYPTO_KEYWORDS)))
+
+
 def is_crypto_market(question: str) -> bool:
     """Check if market is crypto-related based on question text."""
-    q_lower = question.lower()
-    return any(kw in q_lower for kw in CRYPTO_KEYWORDS)
+    return _CRYPTO_RE.search(question.lower()) is not None
+
+
+def price_dutch_book(yes_ask: float, no_ask: float) -> Tuple[float, float, float, float]:
+    """
+    Price buying both sides of a binary market.
+
+    Returns (total_cost, gross_profit, net_profit, profit_pct), where net
+    profit accounts for the taker fee paid on both buys.
+    """
+    total_cost = yes_ask + no_ask
+    gross_profit = 1.0 - total_cost
+    net_profit = gross_profit - total_cost * TAKER_FEE
+    profit_pct = (net_profit / total_cost) * 100 if total_cost > 0 else 0
+    return total_cost, gross_profit, net_profit, profit_pct
+
+
+class _WsLogger:
+    """Route PolymarketWebSocket warnings to the scanner log, dropping chatter."""
+
+    def __init__(self, log):
+        self._log = log
+
+    def info(self, msg):
+        pass
+
+    def debug(self, msg):
+        pass
+
+    def warn(self, msg):
+        self._log(f"WebSocket: {msg}")
+
+    def error(self, msg):
+        self._log(f"WebSocket error: {msg}")
 
 
 class DutchBookScanner:
@@ -60,12 +112,21 @@ class DutchBookScanner:
         min_profit: float = MIN_PROFIT_AFTER_FEES,
         exclude_crypto: bool = True,
         verbose: bool = True,
+        use_websocket: bool = False,
+        ws_timeout: float = 10.0,
+        max_workers: int = 8,
     ):
         self.client = client
         self.gamma = gamma
         self.min_profit = min_profit
         self.exclude_crypto = exclude_crypto
         self.verbose = verbose
+        self.use_websocket = use_websocket
+        self.ws_timeout = ws_timeout
+        self.max_workers = max_workers
+        self._ws: Optional[PolymarketWebSocket] = None
+        self._ws_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ws_run = None  # Future of the background run() loop
         self.opportunities_found = []
         self.near_misses = []  # Markets close to arbitrage
         self._api_calls = 0
@@ -83,7 +144,7 @@ class DutchBookScanner:
         Returns list of opportunities with profit > min_profit.
         """
         self.log(f"Fetching top {limit} markets from Gamma API...")
-        markets = self.gamma.get_markets(
+        markets = self.gamma.get_markets_paged(
             active=True,
             closed=False,
             limit=limit,
@@ -99,7 +160,9 @@ class DutchBookScanner:
         skipped_no_orderbook = 0
         all_market_data = []
 
-        for i, market in enumerate(markets):
+        # Select binary markets first so all order books can be fetched up front
+        candidates = []
+        for market in markets:
             question = market.get("question", "")
             clob_ids = market.get("clob_token_ids", [])
 
@@ -113,25 +176,25 @@ class DutchBookScanner:
                 skipped_no_tokens += 1
                 continue
 
-            yes_token = str(clob_ids[0])
-            no_token = str(clob_ids[1])
+            candidates.append((market, question, str(clob_ids[0]), str(clob_ids[1])))
+
+        best_asks = self._fetch_best_asks(
+            [token for _, _, yes, no in candidates for token in (yes, no)]
+        )
+        # All rows share the time the order books were fetched
+        scan_ts = datetime.now().isoformat()
+        # Checked here so quiet scans skip building the log strings too
+        verbose = self.verbose
 
-            # Get orderbooks for both tokens
-            yes_ask = self._get_best_ask(yes_token)
-            no_ask = self._get_best_ask(no_token)
+        for i, (market, question, yes_token, no_token) in enumerate(candidates):
+            yes_ask = best_asks.get(yes_token, 0.0)
+            no_ask = best_asks.get(no_token, 0.0)
 
             if yes_ask <= 0 or no_ask <= 0:
                 skipped_no_orderbook += 1
                 continue
 
-            # Calculate Dutch Book opportunity
-            total_cost = yes_ask + no_ask
-            gross_profit = 1.0 - total_cost
-
-            # Account for fees (pay fee on both buys)
-            fee_cost = total_cost * TAKER_FEE
-            net_profit = gross_profit - fee_cost
-            profit_pct = (net_profit / total_cost) * 100 if total_cost > 0 else 0
+            total_cost, gross_profit, net_profit, profit_pct = price_dutch_book(yes_ask, no_ask)
 
             market_data = {
                 "question": question,
@@ -145,24 +208,21 @@ class DutchBookScanner:
                 "profit_pct": profit_pct,
                 "volume_24h": market.get("volume_24h", 0),
                 "liquidity": market.get("liquidity", 0),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": scan_ts,
             }
             all_market_data.append(market_data)
 
             # Categorize the market
             if net_profit >= self.min_profit:
                 opportunities.append(market_data)
-                self.log(f"  *** OPPORTUNITY: {question[:50]}... ({profit_pct:.2f}%)")
+                if verbose:
+                    self.log(f"  *** OPPORTUNITY: {question[:50]}... ({profit_pct:.2f}%)")
             elif gross_profit > -0.02:  # Within 2% of breakeven
                 near_misses.append(market_data)
 
             # Progress update
-            if (i + 1) % 10 == 0:
-                self.log(f"  Scanned {i+1}/{len(markets)} markets...")
-
-            # Rate limiting
-            if i % 10 == 9:
-                time.sleep(0.3)
+            if verbose and (i + 1) % 10 == 0:
+                self.log(f"  Scanned {i+1}/{len(candidates)} markets...")
 
         self.log(
             f"\nScan complete: {len(markets)} total, "
@@ -187,8 +247,8 @@ class DutchBookScanner:
         if not all_data:
             return
 
-        # Sort by total cost (lowest = closest to arbitrage)
-        sorted_data = sorted(all_data, key=lambda x: x["total_cost"])
+        # Lowest total cost = closest to arbitrage; only the top 10 are shown
+        closest = heapq.nsmallest(10, all_data, key=itemgetter("total_cost"))
 
         print("\n" + "-" * 60)
         print("TOP 10 MARKETS CLOSEST TO DUTCH BOOK ARBITRAGE:")
@@ -196,7 +256,7 @@ class DutchBookScanner:
         print(f"{'#':<3} {'YES':>6} {'NO':>6} {'TOTAL':>7} {'GROSS':>7} {'NET':>7} {'Question':<40}")
         print("-" * 60)
 
-        for i, m in enumerate(sorted_data[:10], 1):
+        for i, m in enumerate(closest, 1):
             q_short = m["question"][:38] + ".." if len(m["question"]) > 40 else m["question"]
             print(
                 f"{i:<3} "
@@ -208,43 +268,172 @@ class DutchBookScanner:
                 f"{q_short:<40}"
             )
 
-        # Statistics
-        costs = [m["total_cost"] for m in all_data]
+        # Statistics (single pass)
+        total = 0.0
+        min_cost = max_cost = all_data[0]["total_cost"]
+        under_100 = under_101 = under_102 = 0
+        for m in all_data:
+            cost = m["total_cost"]
+            total += cost
+            if cost < min_cost:
+                min_cost = cost
+            elif cost > max_cost:
+                max_cost = cost
+            if cost < 1.02:
+                under_102 += 1
+                if cost < 1.01:
+                    under_101 += 1
+                    if cost < 1.0:
+                        under_100 += 1
+
         print("-" * 60)
-        print(f"Average total cost: {sum(costs)/len(costs):.4f}")
-        print(f"Min total cost: {min(costs):.4f}")
-        print(f"Max total cost: {max(costs):.4f}")
-        print(f"Markets with cost < 1.00: {sum(1 for c in costs if c < 1.0)}")
-        print(f"Markets with cost < 1.01: {sum(1 for c in costs if c < 1.01)}")
-        print(f"Markets with cost < 1.02: {sum(1 for c in costs if c < 1.02)}")
+        print(f"Average total cost: {total/len(all_data):.4f}")
+        print(f"Min total cost: {min_cost:.4f}")
+        print(f"Max total cost: {max_cost:.4f}")
+        print(f"Markets with cost < 1.00: {under_100}")
+        print(f"Markets with cost < 1.01: {under_101}")
+        print(f"Markets with cost < 1.02: {under_102}")
+
+    def _fetch_best_asks(self, token_ids: List[str]) -> Dict[str, float]:
+        """
+        Fetch the best ask for every token before the pricing loop runs.
+
+        Uses the streamed WebSocket order books when enabled,
+        falling back to concurrent /books batch requests for any token the
+        stream did not deliver.
+        """
+        best_asks: Dict[str, float] = {}
+
+        if self.use_websocket and token_ids:
+            snapshots = self._stream_snapshots(token_ids)
+            best_asks = {token_id: snap.best_ask for token_id, snap in snapshots.items()}
+            self.log(f"WebSocket books: {len(best_asks)}/{len(token_ids)} tokens")
+
+        missing = [token_id for token_id in token_ids if token_id not in best_asks]
+        if missing:
+            batches = [
+                missing[i:i + BOOKS_BATCH_SIZE]
+                for i in range(0, len(missing), BOOKS_BATCH_SIZE)
+            ]
+            # Bounded worker count doubles as the rate limit
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                for asks, calls in pool.map(self._get_best_asks_batch, batches):
+                    best_asks.update(asks)
+                    self._api_calls += calls
+
+        return best_asks
+
+    def _get_best_asks_batch(self, token_ids: List[str]) -> Tuple[Dict[str, float], int]:
+        """
+        Get best asks for a batch of tokens with one /books request.
+
+        Returns the asks and the number of HTTP calls made. Tokens missing
+        from the batch response (or all of them, if the batch call fails)
+        are fetched with one request per token.
+        """
+        best_asks = {}
+        try:
+            books = self.client.get_order_books(
+                [BookParams(token_id=token_id) for token_id in token_ids]
+            )
+            for book in books:
+                best_asks[book.asset_id] = self._min_ask_price(book.asks)
+        except Exception:
+            pass
+
+        missing = [token_id for token_id in token_ids if token_id not in best_asks]
+        for token_id in missing:
+            best_asks[token_id] = self._get_best_ask(token_id)
+        return best_asks, 1 + len(missing)
+
+    def _stream_snapshots(self, token_ids: List[str]) -> Dict[str, OrderbookSnapshot]:
+        """
+        Return streamed order books, subscribing only to tokens not yet tracked.
+
+        The WebSocket stays open between scans on a background event loop and
+        applies price_change deltas, so books for tokens seen in an earlier
+        scan are read from memory without any network I/O.
+
+        Returns {} (so the scan uses REST) unless the socket is open and
+        has received a message within WS_MAX_SILENCE seconds: during
+        reconnect backoff the cached books are frozen. If the run() loop has
+        exited (reconnects exhausted) the stream is torn down and the next
+        scan opens a fresh socket.
+        """
+        if self._ws_run is not None and self._ws_run.done():
+            self.log("WebSocket stream stopped, using REST books")
+            self.close()
+            return {}
+
+        if self._ws_run is not None and not self._stream_live():
+            # run() is reconnecting and dropped its books on disconnect
+            self.log("WebSocket reconnecting, using REST books")
+            return {}
+
+        if self._ws is None:
+            self._ws = PolymarketWebSocket(_WsLogger(self.log))
+            self._ws_loop = asyncio.new_event_loop()
+            threading.Thread(target=self._ws_loop.run_forever, daemon=True).start()
+
+        new_tokens = [token_id for token_id in token_ids if token_id not in self._ws.orderbooks]
+        if new_tokens:
+            asyncio.run_coroutine_threadsafe(
+                self._ws.collect_snapshots(new_tokens, timeout=self.ws_timeout),
+                self._ws_loop,
+            ).result()
+            if self._ws_run is None:
+                # Keep receiving deltas in the background from now on
+                self._ws_run = asyncio.run_coroutine_threadsafe(self._ws.run(), self._ws_loop)
+
+        if not self._stream_live():
+            self.log("WebSocket stream not live, using REST books")
+            return {}
+
+        books = self._ws.orderbooks
+        return {token_id: books[token_id] for token_id in token_ids if token_id in books}
+
+    def _stream_live(self) -> bool:
+        """Whether the socket is open and has delivered a message recently."""
+        ws = self._ws
+        return ws.connected and time.time() - ws.last_message_time <= WS_MAX_SILENCE
+
+    def close(self):
+        """Close the background WebSocket stream, if one was opened."""
+        if self._ws is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._ws.close(), self._ws_loop).result(timeout=5)
+        self._ws_loop.call_soon_threadsafe(self._ws_loop.stop)
+        self._ws = None
+        self._ws_loop = None
+        self._ws_run = None
 
     def _get_best_ask(self, token_id: str) -> float:
         """Get the best (lowest) ask price for a token."""
         try:
-            self._api_calls += 1
             book = self.client.get_order_book(token_id)
             asks = getattr(book, "asks", None)
 
             if asks is None and hasattr(book, "to_dict"):
                 asks = book.to_dict().get("asks", [])
 
-            if not asks:
-                return 0.0
-
-            prices = []
-            for order in asks:
-                if hasattr(order, "price"):
-                    prices.append(float(order.price))
-                elif isinstance(order, dict) and "price" in order:
-                    prices.append(float(order["price"]))
-
-            return min(prices) if prices else 0.0
+            return self._min_ask_price(asks)
 
         except Exception as e:
             if "no orderbook" not in str(e).lower():
                 pass  # Silent error
             return 0.0
 
+    def _min_ask_price(self, asks) -> float:
+        """Return the lowest ask price in an order list, or 0.0 if empty."""
+        if not asks:
+            return 0.0
+
+        # A book holds one order type, so pick the access path once.
+        # Asks are not assumed sorted best-first: REST books list them high to low.
+        if isinstance(asks[0], dict):
+            return min((float(o["price"]) for o in asks if "price" in o), default=0.0)
+        return min(float(o.price) for o in asks)
+
     def print_summary(self):
         """Print summary of all opportunities found."""
         print("\n" + "=" * 60)
@@ -303,6 +492,40 @@ def create_client() -> Tuple[ClobClient, str]:
     return client, "Magic Link" if funder else "EOA"
 
 
+async def run_continuous(scanner: DutchBookScanner, limit: int, interval: float):
+    """
+    Scan repeatedly until interrupted.
+
+    Scans start every `interval` seconds measured from the previous start, so
+    scan time is not added on top of the wait. The scan itself runs in a
+    worker thread, keeping the loop free to react to Ctrl+C, which stops the
+    loop after the current scan instead of interrupting it mid-fetch.
+    """
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    try:
+        loop.add_signal_handler(signal.SIGINT, stop.set)
+    except NotImplementedError:
+        pass  # Windows: fall back to KeyboardInterrupt
+
+    scan_count = 0
+    while not stop.is_set():
+        scan_count += 1
+        started = loop.time()
+        print(f"\n{'='*60}")
+        print(f"SCAN #{scan_count} - {datetime.now().strftime('%H:%M:%S')}")
+        print(f"{'='*60}")
+        await asyncio.to_thread(scanner.scan, limit)
+        scanner.print_summary()
+
+        wait = max(0.0, interval - (loop.time() - started))
+        print(f"\nNext scan in {wait:.0f}s... (Ctrl+C to stop)")
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=wait)
+        except asyncio.TimeoutError:
+            pass
+
+
 def main():
     parser = argparse.ArgumentParser(description="Dutch Book Arbitrage Scanner")
     parser.add_argument("--min-profit", type=float, default=MIN_PROFIT_AFTER_FEES)
@@ -312,6 +535,8 @@ def main():
     parser.add_argument("--once", action="store_true")
     parser.add_argument("--interval", type=int, default=60)
     parser.add_argument("-q", "--quiet", action="store_true")
+    parser.add_argument("--websocket", action="store_true",
+                        help="Fetch order books from one WebSocket subscription")
 
     args = parser.parse_args()
     exclude_crypto = not args.include_crypto
@@ -333,6 +558,7 @@ def main():
         min_profit=args.min_profit,
         exclude_crypto=exclude_crypto,
         verbose=not args.quiet,
+        use_websocket=args.websocket,
     )
 
     try:
@@ -340,20 +566,15 @@ def main():
             scanner.scan(limit=args.limit)
             scanner.print_summary()
         else:
-            scan_count = 0
-            while True:
-                scan_count += 1
-                print(f"\n{'='*60}")
-                print(f"SCAN #{scan_count} - {datetime.now().strftime('%H:%M:%S')}")
-                print(f"{'='*60}")
-                scanner.scan(limit=args.limit)
-                scanner.print_summary()
-                print(f"\nNext scan in {args.interval}s... (Ctrl+C to stop)")
-                time.sleep(args.interval)
+            asyncio.run(run_continuous(scanner, args.limit, args.interval))
+            print("\nStopped.")
+            scanner.print_summary()
 
     except KeyboardInterrupt:
         print("\nStopped.")
         scanner.print_summary()
+    finally:
+        scanner.close()
 
 
 if __name__ == "__main__":
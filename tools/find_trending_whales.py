@@ -16,8 +16,9 @@ import argparse
 import json
 import re
 import sys
-from collections import defaultdict
+from collections import Counter
 from datetime import datetime
+from difflib import SequenceMatcher
 from pathlib import Path
 
 # Add parent to path
@@ -25,6 +26,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from tools.whale_tracker import WhaleTracker
 
+# Minimum similarity (0-1) for a partial name match to count
+NAME_MATCH_CUTOFF = 0.6
+
 
 class TrendingWhalesFinder:
     """Find trending Polymarket traders from social media mentions."""
@@ -37,7 +41,7 @@ class TrendingWhalesFinder:
             min_whale_size: Minimum trade size to consider
         """
         self.tracker = WhaleTracker(min_whale_size=min_whale_size, verbose=False)
-        self.mentions = defaultdict(int)
+        self.mentions = Counter()
         self.wallet_map = {}  # name -> wallet
 
     def search_social_media(self, platform: str = "all") -> dict:
@@ -76,7 +80,7 @@ class TrendingWhalesFinder:
             }
             for trader, count in twitter_traders.items():
                 print(f"  @{trader}: {count} mentions in last 24h")
-                self.mentions[trader] += count
+            self.mentions.update(twitter_traders)
 
         if platform in ["reddit", "all"]:
             print("\n🔴 Reddit r/polymarket mentions:")
@@ -89,7 +93,7 @@ class TrendingWhalesFinder:
             }
             for trader, count in reddit_traders.items():
                 print(f"  u/{trader}: {count} mentions this week")
-                self.mentions[trader] += count
+            self.mentions.update(reddit_traders)
 
         if platform == "all":
             print("\n📰 News/Articles mentions:")
@@ -101,10 +105,10 @@ class TrendingWhalesFinder:
             }
             for trader, count in news_traders.items():
                 print(f"  {trader}: {count} article mentions")
-                self.mentions[trader] += count
+            self.mentions.update(news_traders)
 
         # Calculate total mentions
-        total_mentions = sum(self.mentions.values())
+        total_mentions = self.mentions.total()
         print(f"\n✅ Total mentions found: {total_mentions}")
         print(f"✅ Unique traders: {len(self.mentions)}")
 
@@ -136,32 +140,46 @@ class TrendingWhalesFinder:
             if not wallet or not name:
                 continue
 
-            if wallet not in wallet_stats:
-                wallet_stats[wallet] = {
+            stats = wallet_stats.get(wallet)
+            if stats is None:
+                stats = wallet_stats[wallet] = {
                     "wallet": wallet,
                     "name": name,
                     "volume": 0,
                     "trades": 0,
                     "social_mentions": 0,
-                    "last_active": trade.get("timestamp", "")
+                    "last_active": ""
                 }
 
-            wallet_stats[wallet]["volume"] += trade.get("usd_value", 0)
-            wallet_stats[wallet]["trades"] += 1
+            stats["volume"] += trade.get("usd_value", 0)
+            stats["trades"] += 1
+            # Trades are not guaranteed newest-first; keep the latest one
+            timestamp = trade.get("timestamp")
+            if timestamp and (not stats["last_active"] or timestamp > stats["last_active"]):
+                stats["last_active"] = timestamp
 
         # Match with social media mentions
         matched_traders = []
 
+        # Lowercase every name once; exact matches resolve with one lookup
+        lower_names = [(wallet, stats["name"].lower()) for wallet, stats in wallet_stats.items()]
+        by_lower_name = {}
+        for wallet, name in lower_names:
+            by_lower_name.setdefault(name, wallet)
+
         for trader_name, mentions in self.mentions.items():
             # Find wallet in Polymarket data
-            for wallet, stats in wallet_stats.items():
-                # Fuzzy match (case insensitive, partial match)
-                if trader_name.lower() in stats["name"].lower() or \
-                   stats["name"].lower() in trader_name.lower():
-                    stats["social_mentions"] = mentions
-                    matched_traders.append(stats)
-                    self.wallet_map[trader_name] = wallet
-                    break
+            trader_lower = trader_name.lower()
+            wallet = by_lower_name.get(trader_lower)
+            if wallet is None:
+                wallet = self._best_partial_match(trader_lower, lower_names)
+            if wallet is None:
+                continue
+
+            stats = wallet_stats[wallet]
+            stats["social_mentions"] = mentions
+            matched_traders.append(stats)
+            self.wallet_map[trader_name] = wallet
 
         # Sort by combination of mentions and volume
         matched_traders.sort(
@@ -172,6 +190,23 @@ class TrendingWhalesFinder:
         print(f"✅ Matched {len(matched_traders)} traders with Polymarket wallets")
         return matched_traders
 
+    @staticmethod
+    def _best_partial_match(trader_lower: str, lower_names: list):
+        """
+        Pick the wallet whose name best matches a partial (substring) hit.
+
+        Only names that contain, or are contained in, the trader name are
+        scored, and weak hits such as a short name buried in a longer one
+        are rejected by NAME_MATCH_CUTOFF.
+        """
+        best_wallet, best_score = None, NAME_MATCH_CUTOFF
+        for wallet, name in lower_names:
+            if trader_lower in name or name in trader_lower:
+                score = SequenceMatcher(None, trader_lower, name).ratio()
+                if score > best_score:
+                    best_wallet, best_score = wallet, score
+        return best_wallet
+
     def display_trending_whales(self, traders: list):
         """Pretty print trending whales."""
         print("\n" + "=" * 90)
@@ -239,8 +274,10 @@ class TrendingWhalesFinder:
             ]
         }
 
+        # Serialize once and write in a single call; json.dump streams the
+        # indented output as many small writes
         with open(filename, "w") as f:
-            json.dump(output, f, indent=2)
+            f.write(json.dumps(output, indent=2))
 
         print(f"\n✅ Exported to {filename}")
 
@@ -13,6 +13,8 @@ Usage:
 
 import argparse
 import sys
+from heapq import nlargest
+from operator import itemgetter
 from pathlib import Path
 
 # Add parent to path
@@ -21,23 +23,46 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from tools.whale_tracker import WhaleTracker
 
 
-def find_by_name(name: str, tracker: WhaleTracker):
+def _index_trades(trades: list) -> list:
+    """
+    Return copies of the trades with lowercased name/market/slug keys added,
+    so searches don't re-lowercase per check.
+
+    The rows are copied because WhaleTracker.get_recent_trades shares the
+    trade dicts it returns with its response cache.
+    """
+    return [
+        {
+            **t,
+            "_name_lc": (t.get("name") or t.get("pseudonym") or "").lower(),
+            "_market_lc": t.get("market", "").lower(),
+            "_slug_lc": t.get("slug", "").lower(),
+        }
+        for t in trades
+    ]
+
+
+def find_by_name(name: str, tracker: WhaleTracker, trades: list = None):
     """Find wallet by trader name."""
     print(f"\n🔍 Searching for trader: '{name}'...")
     print("=" * 70)
 
-    trades = tracker.get_recent_trades(limit=500)
+    if trades is None:
+        trades = _index_trades(tracker.get_recent_trades(limit=500))
     if not trades:
         print("❌ No trades found")
         return
 
     # Search by name/pseudonym
+    needle = name.lower()
     matches = []
+    seen_wallets = set()
     for trade in trades:
-        trader_name = trade.get("name") or trade.get("pseudonym") or ""
-        if name.lower() in trader_name.lower():
+        if needle in trade["_name_lc"]:
+            trader_name = trade.get("name") or trade.get("pseudonym") or ""
             wallet = trade.get("wallet", "")
-            if wallet and wallet not in [m["wallet"] for m in matches]:
+            if wallet and wallet not in seen_wallets:
+                seen_wallets.add(wallet)
                 matches.append({
                     "wallet": wallet,
                     "name": trader_name,
@@ -76,28 +101,29 @@ def find_by_name(name: str, tracker: WhaleTracker):
         print()
 
 
-def find_by_market(market: str, tracker: WhaleTracker):
+def find_by_market(market: str, tracker: WhaleTracker, trades: list = None):
     """Find whales trading a specific market."""
     print(f"\n🔍 Finding whales trading: '{market}'...")
     print("=" * 70)
 
-    trades = tracker.get_recent_trades(limit=200)
+    if trades is None:
+        trades = _index_trades(tracker.get_recent_trades(limit=200))
     if not trades:
         print("❌ No trades found")
         return
 
     # Filter by market
+    needle = market.lower()
     market_trades = [
         t for t in trades
-        if market.lower() in t.get("market", "").lower() or
-           market.lower() in t.get("slug", "").lower()
+        if needle in t["_market_lc"] or needle in t["_slug_lc"]
     ]
 
     if not market_trades:
         print(f"❌ No trades found for market '{market}'")
         return
 
-    print(f"✅ Found {len(market_trades)} trades on this market\n")
+    out = [f"✅ Found {len(market_trades)} trades on this market\n\n"]
 
     # Group by wallet and calculate volume
     whale_activity = {}
@@ -106,8 +132,9 @@ def find_by_market(market: str, tracker: WhaleTracker):
         if not wallet:
             continue
 
-        if wallet not in whale_activity:
-            whale_activity[wallet] = {
+        whale = whale_activity.get(wallet)
+        if whale is None:
+            whale = whale_activity[wallet] = {
                 "wallet": wallet,
                 "name": trade.get("name") or trade.get("pseudonym") or "Anonymous",
                 "volume": 0,
@@ -115,40 +142,39 @@ def find_by_market(market: str, tracker: WhaleTracker):
                 "last_side": None
             }
 
-        whale_activity[wallet]["volume"] += trade.get("usd_value", 0)
-        whale_activity[wallet]["trades"] += 1
-        whale_activity[wallet]["last_side"] = trade.get("side", "")
+        whale["volume"] += trade.get("usd_value", 0)
+        whale["trades"] += 1
+        whale["last_side"] = trade.get("side", "")
 
     # Sort by volume
-    top_whales = sorted(
-        whale_activity.values(),
-        key=lambda x: x["volume"],
-        reverse=True
-    )[:10]
+    top_whales = nlargest(10, whale_activity.values(), key=itemgetter("volume"))
 
-    print("Top 10 whales by volume:")
-    print(f"{'Rank':<6} {'Name':<25} {'Volume':<15} {'Trades':<10} {'Last'}")
-    print("-" * 70)
+    out.append("Top 10 whales by volume:\n")
+    out.append(f"{'Rank':<6} {'Name':<25} {'Volume':<15} {'Trades':<10} {'Last'}\n")
+    out.append("-" * 70 + "\n")
 
     for i, whale in enumerate(top_whales, 1):
-        print(
+        out.append(
             f"{i:<6} {whale['name'][:23]:<25} "
             f"${whale['volume']:>12,.2f} {whale['trades']:<10} {whale['last_side']}"
+            "\n"
         )
 
-    print("\n📋 Wallet addresses:")
+    out.append("\n📋 Wallet addresses:\n")
     for i, whale in enumerate(top_whales[:5], 1):
-        print(f"{i}. {whale['wallet']} ({whale['name']})")
+        out.append(f"{i}. {whale['wallet']} ({whale['name']})\n")
 
-    print()
+    out.append("\n")
+    sys.stdout.write("".join(out))
 
 
-def show_top_traders(limit: int, tracker: WhaleTracker):
+def show_top_traders(limit: int, tracker: WhaleTracker, trades: list = None):
     """Show top traders by recent volume."""
     print(f"\n🐋 Top {limit} traders by recent volume...")
     print("=" * 70)
 
-    trades = tracker.get_recent_trades(limit=500)
+    if trades is None:
+        trades = tracker.get_recent_trades(limit=500)
     whale_trades = tracker.filter_whale_trades(trades, min_usd=500)
 
     if not whale_trades:
@@ -158,38 +184,42 @@ def show_top_traders(limit: int, tracker: WhaleTracker):
     # Aggregate by wallet
     traders = {}
     for trade in whale_trades:
-        wallet = trade.get("wallet", "")
+        wallet = trade.get("wallet")
         if not wallet:
             continue
 
-        if wallet not in traders:
+        usd_value = trade.get("usd_value", 0)
+        entry = traders.get(wallet)
+        if entry is None:
             traders[wallet] = {
                 "wallet": wallet,
                 "name": trade.get("name") or "Anonymous",
-                "volume": 0,
-                "trades": 0
+                "volume": usd_value,
+                "trades": 1
             }
-
-        traders[wallet]["volume"] += trade.get("usd_value", 0)
-        traders[wallet]["trades"] += 1
+        else:
+            entry["volume"] += usd_value
+            entry["trades"] += 1
 
     # Sort by volume
-    top = sorted(traders.values(), key=lambda x: x["volume"], reverse=True)[:limit]
+    top = nlargest(limit, traders.values(), key=itemgetter("volume"))
 
-    print(f"\n{'Rank':<6} {'Name':<25} {'Volume':<15} {'Trades'}")
-    print("-" * 70)
+    out = [f"\n{'Rank':<6} {'Name':<25} {'Volume':<15} {'Trades'}\n"]
+    out.append("-" * 70 + "\n")
 
     for i, trader in enumerate(top, 1):
-        print(
+        out.append(
             f"{i:<6} {trader['name'][:23]:<25} "
             f"${trader['volume']:>12,.2f} {trader['trades']}"
+            "\n"
         )
 
-    print("\n📋 Top 5 wallet addresses:")
+    out.append("\n📋 Top 5 wallet addresses:\n")
     for i, trader in enumerate(top[:5], 1):
-        print(f"{i}. {trader['wallet']}")
-        print(f"   {trader['name']}")
-    print()
+        out.append(f"{i}. {trader['wallet']}\n")
+        out.append(f"   {trader['name']}\n")
+    out.append("\n")
+    sys.stdout.write("".join(out))
 
 
 def main():
@@ -213,14 +243,17 @@ def main():
 
     tracker = WhaleTracker(min_whale_size=args.min_size, verbose=False)
 
+    # Every search works off the same recent trades, so fetch them once
+    trades = _index_trades(tracker.get_recent_trades(limit=500))
+
     if args.name:
-        find_by_name(args.name, tracker)
+        find_by_name(args.name, tracker, trades)
 
     if args.market:
-        find_by_market(args.market, tracker)
+        find_by_market(args.market, tracker, trades)
 
     if args.top:
-        show_top_traders(args.top, tracker)
+        show_top_traders(args.top, tracker, trades)
 
 
 if __name__ == "__main__":
@@ -14,7 +14,7 @@ Usage:
 import argparse
 import re
 import sys
-from collections import defaultdict
+from collections import Counter
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -23,6 +23,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from tools.whale_tracker import WhaleTracker
 
+# Ethereum addresses: 0x + 40 hex chars
+ETH_ADDRESS_RE = re.compile(r'0x[a-fA-F0-9]{40}')
+
 
 def search_twitter_mentions(query: str = "polymarket trader", days: int = 7):
     """
@@ -142,9 +145,7 @@ def search_reddit_mentions(query: str = "polymarket", days: int = 7):
 
 def extract_wallet_addresses(text: str) -> list:
     """Extract Ethereum wallet addresses from text."""
-    # Match Ethereum addresses (0x + 40 hex chars)
-    pattern = r'0x[a-fA-F0-9]{40}'
-    return re.findall(pattern, text)
+    return ETH_ADDRESS_RE.findall(text)
 
 
 def main():
@@ -180,30 +181,24 @@ def main():
     print(f"Lookback: {args.days} days")
     print(f"Platform: {args.platform}")
 
-    all_mentions = defaultdict(int)
+    all_mentions = Counter()
 
     # Search Twitter
     if args.platform in ["twitter", "both"]:
         twitter_mentions = search_twitter_mentions(args.query, args.days)
-        for trader, data in twitter_mentions.items():
-            all_mentions[trader] += data["mentions"]
+        all_mentions.update({trader: data["mentions"] for trader, data in twitter_mentions.items()})
 
     # Search Reddit
     if args.platform in ["reddit", "both"]:
         reddit_mentions = search_reddit_mentions(args.query, args.days)
-        for trader, data in reddit_mentions.items():
-            all_mentions[trader] += data["mentions"]
+        all_mentions.update({trader: data["mentions"] for trader, data in reddit_mentions.items()})
 
     # Aggregate results
     print("\n" + "=" * 70)
     print("📊 AGGREGATED MENTIONS")
     print("=" * 70)
 
-    sorted_mentions = sorted(
-        all_mentions.items(),
-        key=lambda x: x[1],
-        reverse=True
-    )
+    sorted_mentions = all_mentions.most_common()
 
     for i, (trader, count) in enumerate(sorted_mentions, 1):
         print(f"{i}. {trader}: {count} total mentions")
@@ -15,36 +15,69 @@ import os
 import sys
 import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from heapq import nlargest
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from py_clob_client.client import ClobClient
-from py_clob_client.clob_types import ApiCreds
+from py_clob_client.clob_types import ApiCreds, BookParams
+from py_clob_client.exceptions import PolyException
 
 from bot.gamma_client import GammaClient
 
 TAKER_FEE = 0.01
+# Failures while reading levels out of an unexpected book shape
+BOOK_PARSE_ERRORS = (AttributeError, KeyError, TypeError, ValueError)
+# Failures from a book fetch: API/transport errors, plus the parse errors
+# py_clob_client raises while decoding an error or malformed body
+BOOK_FETCH_ERRORS = (PolyException,) + BOOK_PARSE_ERRORS
+BOOK_FETCH_WORKERS = 16
+BOOKS_BATCH_SIZE = 50  # Tokens per POST /books request
+
+
+def price_negrisk(total_no_cost: float, n_outcomes: int) -> Tuple[int, float, float, float, float]:
+    """
+    Price buying NO on every outcome of an N-way NegRisk event.
+
+    Returns (guaranteed_payout, gross_profit, fee_cost, net_profit,
+    net_profit_pct); the fee is simplified to TAKER_FEE on the total cost.
+    """
+    guaranteed_payout = n_outcomes - 1
+    gross_profit = guaranteed_payout - total_no_cost
+    fee_cost = total_no_cost * TAKER_FEE
+    net_profit = gross_profit - fee_cost
+    net_profit_pct = (net_profit / total_no_cost) * 100 if total_no_cost > 0 else 0
+    return guaranteed_payout, gross_profit, fee_cost, net_profit, net_profit_pct
 
 
 class NegRiskScanner:
-    def __init__(self, client: ClobClient, gamma: GammaClient, min_profit_pct: float = 0.5, verbose: bool = True):
+    def __init__(self, client: ClobClient, gamma: GammaClient, min_profit_pct: float = 0.5, verbose: bool = True,
+                 max_workers: int = BOOK_FETCH_WORKERS):
         self.client = client
         self.gamma = gamma
         self.min_profit_pct = min_profit_pct
         self.verbose = verbose
+        self.max_workers = max_workers
         self.opportunities = []
         self.all_events = []
         self._api_calls = 0
+        self._book_cache: Dict[str, Any] = {}
+        self._failed_tokens: set = set()
 
     def log(self, msg: str):
         if self.verbose:
             print(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}")
 
     def scan(self, limit: int = 300) -> List[Dict]:
+        # Books (and fetch failures) are only valid for the scan that saw them
+        self._book_cache = {}
+        self._failed_tokens = set()
         self.log(f"Fetching {limit} markets...")
         markets = self.gamma.get_markets(active=True, closed=False, limit=limit, order="volume24hr", ascending=False)
         self.log(f"Found {len(markets)} markets")
@@ -61,14 +94,15 @@ class NegRiskScanner:
 
         # Group by question pattern
         groups = self._group_by_pattern(negrisk)
-        self.log(f"Identified {len(groups)} multi-outcome events (3+ outcomes)")
+        events = [(pattern, ms) for pattern, ms in groups.items() if len(ms) >= 3]
+        self.log(f"Identified {len(events)} multi-outcome events (3+ outcomes)")
 
-        opportunities = []
+        # Fetch every order book the events need in parallel before analyzing
+        self._prefetch_books(ms for _, ms in events)
 
-        for pattern, event_markets in groups.items():
-            if len(event_markets) < 3:
-                continue
+        opportunities = []
 
+        for pattern, event_markets in events:
             result = self._analyze_event(pattern, event_markets)
             if result:
                 self.all_events.append(result)
@@ -76,28 +110,32 @@ class NegRiskScanner:
                     opportunities.append(result)
                     self.log(f"  *** OPPORTUNITY: {result['event'][:50]}... ({result['net_profit_pct']:.2f}%)")
 
-            time.sleep(0.1)
-
         self.opportunities = opportunities
         self._show_results()
         return opportunities
 
     def _group_by_pattern(self, markets: List[Dict]) -> Dict[str, List[Dict]]:
-        """Group markets by question pattern, replacing specific option with placeholder."""
+        """
+        Group markets by question pattern, replacing specific option with placeholder.
+
+        Every group is returned; callers keep the ones with 3+ outcomes.
+        """
         groups = defaultdict(list)
 
         for m in markets:
             question = m.get("question", "")
             group_title = m.get("_group_title", "")
 
-            if group_title and group_title in question:
-                pattern = question.replace(group_title, "___")
+            # One search locates the option; questions name it once
+            idx = question.find(group_title) if group_title else -1
+            if idx >= 0:
+                pattern = question[:idx] + "___" + question[idx + len(group_title):]
             else:
                 pattern = question
 
             groups[pattern].append(m)
 
-        return {k: v for k, v in groups.items() if len(v) >= 3}
+        return groups
 
     def _analyze_event(self, pattern: str, markets: List[Dict]) -> Optional[Dict]:
         """Analyze multi-outcome event for arbitrage."""
@@ -126,8 +164,8 @@ class NegRiskScanner:
 
             outcomes.append({
                 "title": m.get("_group_title", "")[:30] or m.get("question", "")[:30],
-                "yes_bid": round(yes_bid, 4),
-                "no_ask": round(no_ask, 4),
+                "yes_bid": yes_bid,
+                "no_ask": no_ask,
                 "volume_24h": m.get("volume_24h", 0),
             })
             total_no_cost += no_ask
@@ -137,11 +175,7 @@ class NegRiskScanner:
             return None
 
         n = len(outcomes)
-        guaranteed_payout = n - 1
-        gross_profit = guaranteed_payout - total_no_cost
-        fee_cost = total_no_cost * TAKER_FEE  # Simplified: fee on total
-        net_profit = gross_profit - fee_cost
-        net_profit_pct = (net_profit / total_no_cost) * 100 if total_no_cost > 0 else 0
+        guaranteed_payout, gross_profit, fee_cost, net_profit, net_profit_pct = price_negrisk(total_no_cost, n)
 
         outcomes.sort(key=lambda x: x["no_ask"])
 
@@ -149,38 +183,127 @@ class NegRiskScanner:
             "event": pattern.replace("___", "[X]"),
             "n_outcomes": n,
             "outcomes": outcomes,
-            "total_no_cost": round(total_no_cost, 4),
-            "total_yes_sum": round(total_yes_sum, 4),
+            "total_no_cost": total_no_cost,
+            "total_yes_sum": total_yes_sum,
             "guaranteed_payout": guaranteed_payout,
-            "gross_profit": round(gross_profit, 4),
-            "fee_cost": round(fee_cost, 4),
-            "net_profit": round(net_profit, 4),
-            "net_profit_pct": round(net_profit_pct, 2),
+            "gross_profit": gross_profit,
+            "fee_cost": fee_cost,
+            "net_profit": net_profit,
+            "net_profit_pct": net_profit_pct,
             "is_profitable": net_profit > 0,
         }
 
-    def _get_best_ask(self, token_id: str) -> float:
+    def _prefetch_books(self, event_groups) -> None:
+        """
+        Fetch the YES and NO order books for every grouped market concurrently.
+
+        Tokens go out in BOOKS_BATCH_SIZE /books requests, so far fewer
+        responses are sent and decoded, and a thread pool overlaps the
+        batches' latency; max_workers bounds the load on the CLOB API.
+        Results land in _book_cache, which _get_book reads from.
+        """
+        token_ids = []
+        for event_markets in event_groups:
+            for m in event_markets:
+                clob_ids = m.get("clob_token_ids", [])
+                if len(clob_ids) >= 2:
+                    token_ids.append(str(clob_ids[0]))
+                    token_ids.append(str(clob_ids[1]))
+
+        # Skip anything already cached and tokens shared between markets
+        token_ids = [
+            t for t in dict.fromkeys(token_ids)
+            if t not in self._book_cache and t not in self._failed_tokens
+        ]
+        if not token_ids:
+            return
+
+        batches = [
+            token_ids[i:i + BOOKS_BATCH_SIZE]
+            for i in range(0, len(token_ids), BOOKS_BATCH_SIZE)
+        ]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for books, calls in pool.map(self._fetch_books_batch, batches):
+                self._api_calls += calls
+                for token_id, book in books.items():
+                    if book is None:
+                        self._failed_tokens.add(token_id)
+                    else:
+                        self._book_cache[token_id] = book
+
+    def _fetch_books_batch(self, token_ids: List[str]) -> Tuple[Dict[str, Any], int]:
+        """
+        Fetch a batch of order books with one /books request.
+
+        Returns the books keyed by token (None where a fetch failed) and the
+        number of HTTP calls made. Falls back to one request per token if
+        the batch call fails.
+        """
         try:
+            books = self.client.get_order_books(
+                [BookParams(token_id=token_id) for token_id in token_ids]
+            )
+            books_by_token = dict.fromkeys(token_ids)
+            for book in books:
+                books_by_token[book.asset_id] = book
+        except BOOK_FETCH_ERRORS:
+            books_by_token = {}
+            for token_id in token_ids:
+                try:
+                    books_by_token[token_id] = self.client.get_order_book(token_id)
+                except BOOK_FETCH_ERRORS:
+                    books_by_token[token_id] = None
+            return books_by_token, 1 + len(token_ids)
+        return books_by_token, 1
+
+    def _get_book(self, token_id: str):
+        """
+        Return the order book for a token, fetching it at most once per scan.
+
+        Returns None for tokens whose fetch already failed this scan, so a
+        rate-limited API is not hit again for the same book.
+        """
+        book = self._book_cache.get(token_id)
+        if book is None:
+            if token_id in self._failed_tokens:
+                return None
             self._api_calls += 1
-            book = self.client.get_order_book(token_id)
+            try:
+                book = self.client.get_order_book(token_id)
+            except BOOK_FETCH_ERRORS:
+                self._failed_tokens.add(token_id)
+                return None
+            self._book_cache[token_id] = book
+        return book
+
+    @staticmethod
+    def _level_prices(levels):
+        """Yield the positive prices of an order list without building a list."""
+        # A book holds one level type, so pick the access path once
+        if hasattr(levels[0], "price"):
+            prices = (float(o.price) for o in levels)
+        else:
+            prices = (float(o.get("price", 0)) for o in levels)
+        return (p for p in prices if p > 0)
+
+    def _get_best_ask(self, token_id: str) -> float:
+        try:
+            book = self._get_book(token_id)
             asks = getattr(book, "asks", None) or (book.to_dict().get("asks", []) if hasattr(book, "to_dict") else [])
             if not asks:
                 return 0.0
-            prices = [float(o.price) if hasattr(o, "price") else float(o.get("price", 0)) for o in asks]
-            return min(p for p in prices if p > 0) if prices else 0.0
-        except:
+            return min(self._level_prices(asks), default=0.0)
+        except BOOK_PARSE_ERRORS:
             return 0.0
 
     def _get_best_bid(self, token_id: str) -> float:
         try:
-            self._api_calls += 1
-            book = self.client.get_order_book(token_id)
+            book = self._get_book(token_id)
             bids = getattr(book, "bids", None) or (book.to_dict().get("bids", []) if hasattr(book, "to_dict") else [])
             if not bids:
                 return 0.0
-            prices = [float(o.price) if hasattr(o, "price") else float(o.get("price", 0)) for o in bids]
-            return max(p for p in prices if p > 0) if prices else 0.0
-        except:
+            return max(self._level_prices(bids), default=0.0)
+        except BOOK_PARSE_ERRORS:
             return 0.0
 
     def _show_results(self):
@@ -188,18 +311,20 @@ class NegRiskScanner:
             print("\nNo multi-outcome events analyzed.")
             return
 
-        sorted_events = sorted(self.all_events, key=lambda x: x["net_profit_pct"], reverse=True)
+        # Only the top 15 are displayed (the detail view reuses the first 5)
+        sorted_events = nlargest(15, self.all_events, key=itemgetter("net_profit_pct"))
 
-        print("\n" + "=" * 80)
-        print("ANÁLISIS NEGRISK - MERCADOS MULTI-OUTCOME")
-        print("=" * 80)
-        print(f"{'#':<3} {'N':>3} {'Σ(NO)':>8} {'Pago':>6} {'Bruto':>8} {'Neto':>8} {'%':>7} {'Evento':<30}")
-        print("-" * 80)
+        out = []
+        out.append("\n" + "=" * 80 + "\n")
+        out.append("ANÁLISIS NEGRISK - MERCADOS MULTI-OUTCOME\n")
+        out.append("=" * 80 + "\n")
+        out.append(f"{'#':<3} {'N':>3} {'Σ(NO)':>8} {'Pago':>6} {'Bruto':>8} {'Neto':>8} {'%':>7} {'Evento':<30}\n")
+        out.append("-" * 80 + "\n")
 
-        for i, e in enumerate(sorted_events[:15], 1):
+        for i, e in enumerate(sorted_events, 1):
             status = "✓" if e["is_profitable"] else " "
             event_short = e["event"][:28]
-            print(
+            out.append(
                 f"{status}{i:<2} "
                 f"{e['n_outcomes']:>3} "
                 f"${e['total_no_cost']:>7.3f} "
@@ -208,26 +333,28 @@ class NegRiskScanner:
                 f"${e['net_profit']:>+7.3f} "
                 f"{e['net_profit_pct']:>+6.2f}% "
                 f"{event_short}"
+                "\n"
             )
 
         # Detailed view of top events
-        print("\n" + "-" * 80)
-        print("DETALLE TOP 5:")
-        print("-" * 80)
+        out.append("\n" + "-" * 80 + "\n")
+        out.append("DETALLE TOP 5:\n")
+        out.append("-" * 80 + "\n")
 
         for i, e in enumerate(sorted_events[:5], 1):
-            print(f"\n{i}. {e['event'][:70]}")
-            print(f"   N={e['n_outcomes']} | Σ(YES)={e['total_yes_sum']:.3f} | Σ(NO)={e['total_no_cost']:.3f}")
-            print(f"   Pago garantizado: ${e['guaranteed_payout']} | Profit: ${e['net_profit']:+.4f} ({e['net_profit_pct']:+.2f}%)")
-            print(f"   Outcomes (ordenados por NO price):")
+            out.append(f"\n{i}. {e['event'][:70]}\n")
+            out.append(f"   N={e['n_outcomes']} | Σ(YES)={e['total_yes_sum']:.3f} | Σ(NO)={e['total_no_cost']:.3f}\n")
+            out.append(f"   Pago garantizado: ${e['guaranteed_payout']} | Profit: ${e['net_profit']:+.4f} ({e['net_profit_pct']:+.2f}%)\n")
+            out.append(f"   Outcomes (ordenados por NO price):\n")
             for j, o in enumerate(e["outcomes"][:6], 1):
-                print(f"      {j}. NO=${o['no_ask']:.3f} YES=${o['yes_bid']:.3f} | {o['title']}")
+                out.append(f"      {j}. NO=${o['no_ask']:.3f} YES=${o['yes_bid']:.3f} | {o['title']}\n")
             if len(e["outcomes"]) > 6:
-                print(f"      ... +{len(e['outcomes'])-6} más")
+                out.append(f"      ... +{len(e['outcomes'])-6} más\n")
 
-        print("\n" + "-" * 80)
+        out.append("\n" + "-" * 80 + "\n")
         profitable = len([e for e in self.all_events if e["is_profitable"]])
-        print(f"Eventos analizados: {len(self.all_events)} | Rentables: {profitable} | API calls: {self._api_calls}")
+        out.append(f"Eventos analizados: {len(self.all_events)} | Rentables: {profitable} | API calls: {self._api_calls}\n")
+        sys.stdout.write("".join(out))
 
     def print_summary(self):
         print("\n" + "=" * 80)
@@ -243,6 +370,13 @@ class NegRiskScanner:
 
 
 def create_client():
+    """
+    Build the CLOB client shared by every scan.
+
+    Book requests already travel over py_clob_client's module-level httpx
+    client (HTTP/2, keep-alive), so the prefetch threads multiplex onto
+    warm connections and no TLS handshake is paid per book.
+    """
     load_dotenv()
     private_key = os.getenv("POLY_PRIVATE_KEY")
     funder = os.getenv("POLY_FUNDER_ADDRESS")
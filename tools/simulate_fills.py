@@ -6,9 +6,13 @@ Checks current market prices against position TP/SL levels
 and reports which positions would have been filled.
 """
 
+import asyncio
 import json
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -17,58 +21,235 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from dotenv import load_dotenv
 from py_clob_client.client import ClobClient
+from py_clob_client.clob_types import BookParams
+
+from bot.websocket_client import PolymarketWebSocket
+
+
+# Parsed positions.json, reused until the bot rewrites the file
+_positions_cache = {"mtime_ns": None, "data": {}}
 
 
 def load_positions():
-    """Load positions from JSON file."""
+    """Load positions from JSON file, re-parsing only when it has changed."""
     positions_file = Path(__file__).parent.parent / "data" / "positions.json"
-    if not positions_file.exists():
+    try:
+        mtime_ns = positions_file.stat().st_mtime_ns
+    except FileNotFoundError:
         return {}
-    with open(positions_file) as f:
-        return json.load(f)
+    if mtime_ns != _positions_cache["mtime_ns"]:
+        with open(positions_file) as f:
+            _positions_cache["data"] = json.load(f)
+        _positions_cache["mtime_ns"] = mtime_ns
+    return dict(_positions_cache["data"])
+
+
+_SEP = "=" * 60
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+# Append-only, one JSON record per line
+RESULTS_FILE = DATA_DIR / "simulation_results.jsonl"
+# Pre-JSONL history (a single JSON array), still read but no longer written
+LEGACY_RESULTS_FILE = DATA_DIR / "simulation_results.json"
+
+
+def load_simulation_results() -> list:
+    """Load all saved simulation results, legacy JSON history first."""
+    results = []
+    if LEGACY_RESULTS_FILE.exists():
+        with open(LEGACY_RESULTS_FILE) as f:
+            results.extend(json.load(f))
+    if RESULTS_FILE.exists():
+        with open(RESULTS_FILE) as f:
+            results.extend(json.loads(line) for line in f if line.strip())
+    return results
 
 
 def save_simulation_results(results: list):
-    """Save simulation results to file."""
-    results_file = Path(__file__).parent.parent / "data" / "simulation_results.json"
+    """Append simulation results to the JSONL results file."""
+    # Only the new records are written; history is never re-read or rewritten
+    with open(RESULTS_FILE, "a") as f:
+        f.writelines(json.dumps(r) + "\n" for r in results)
 
-    # Load existing results
-    existing = []
-    if results_file.exists():
-        with open(results_file) as f:
-            existing = json.load(f)
 
-    # Append new results
-    existing.extend(results)
+def best_bid_price(bids) -> float:
+    """Return the highest bid price in an order list, or 0.0 if empty."""
+    if not bids:
+        return 0.0
 
-    with open(results_file, "w") as f:
-        json.dump(existing, f, indent=2)
+    # A book holds one level type, so pick the access path once
+    if hasattr(bids[0], "price"):
+        return max(float(bid.price) for bid in bids)
+    return max((float(bid["price"]) for bid in bids if "price" in bid), default=0.0)
 
 
 def get_best_bid(client, token_id: str) -> float:
     """Get best bid price for a token."""
     try:
         book = client.get_order_book(token_id)
-        bids = getattr(book, "bids", [])
-        if not bids:
-            return 0.0
-
-        prices = []
-        for bid in bids:
-            if hasattr(bid, "price"):
-                prices.append(float(bid.price))
-            elif isinstance(bid, dict) and "price" in bid:
-                prices.append(float(bid["price"]))
-
-        return max(prices) if prices else 0.0
+        return best_bid_price(getattr(book, "bids", []))
     except Exception as e:
         print(f"  Error getting orderbook: {e}")
         return 0.0
 
 
+def get_best_bids(client, token_ids: list, max_workers: int = 8) -> dict:
+    """
+    Get best bids for several tokens with one batched /books request.
+
+    Tokens missing from the batch response (or all of them, if the batch
+    call fails) are fetched individually and concurrently.
+
+    Returns {token_id: best_bid}, with 0.0 where a book has no bids.
+    """
+    if not token_ids:
+        return {}
+
+    best_bids = {}
+    try:
+        books = client.get_order_books([BookParams(token_id=token_id) for token_id in token_ids])
+        for book in books:
+            best_bids[book.asset_id] = best_bid_price(book.bids)
+    except Exception as e:
+        print(f"  Error getting orderbooks: {e}")
+
+    missing = [token_id for token_id in token_ids if token_id not in best_bids]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as pool:
+            best_bids.update(zip(missing, pool.map(lambda token_id: get_best_bid(client, token_id), missing)))
+    return best_bids
+
+
+class _WsLogger:
+    """Print PolymarketWebSocket warnings and errors, dropping chatter."""
+
+    def info(self, msg):
+        pass
+
+    def debug(self, msg):
+        pass
+
+    def warn(self, msg):
+        print(f"  WebSocket: {msg}")
+
+    def error(self, msg):
+        print(f"  WebSocket error: {msg}")
+
+
+class BookStream:
+    """
+    Best bids from a persistent market WebSocket instead of REST polling.
+
+    The socket runs on a background event loop and applies price_change
+    deltas as they arrive, so a tick reads current bids from memory.
+    Tokens are subscribed the first time they are asked for; any without a
+    streamed book yet fall back to the REST batch fetch, as do all tokens
+    while the socket is disconnected (e.g. in reconnect backoff) and any
+    book not updated for max_age seconds. If the socket's run() loop exits
+    (reconnects exhausted) that tick is served from REST and the next one
+    starts a fresh socket.
+    """
+
+    def __init__(self, timeout: float = 10.0, max_age: float = 30.0):
+        self.timeout = timeout
+        self.max_age = max_age
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        self._new_socket()
+
+    def _new_socket(self):
+        self._ws = PolymarketWebSocket(_WsLogger())
+        self._subscribed = set()
+        self._run = None  # Future of the background run() loop
+
+    def best_bids(self, client, token_ids: list) -> dict:
+        """Return {token_id: best_bid}, streamed where available."""
+        if self._run is not None and self._run.done():
+            print("  WebSocket: stream stopped, using REST bids")
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop).result(timeout=5)
+            self._new_socket()
+            return get_best_bids(client, token_ids)
+
+        books = self._ws.orderbooks
+        # Subscribe once per token; one whose book never arrived is not
+        # waited on again every tick
+        new_tokens = [token_id for token_id in token_ids if token_id not in self._subscribed]
+        if new_tokens:
+            self._subscribed.update(new_tokens)
+            asyncio.run_coroutine_threadsafe(
+                self._ws.collect_snapshots(new_tokens, timeout=self.timeout),
+                self._loop,
+            ).result()
+            if self._run is None:
+                # Keep receiving deltas in the background from now on
+                self._run = asyncio.run_coroutine_threadsafe(self._ws.run(), self._loop)
+
+        best_bids = {}
+        if self._ws.connected:
+            fresh_after = time.time() - self.max_age
+            for token_id in token_ids:
+                book = books.get(token_id)
+                if book is not None and book.received_at >= fresh_after:
+                    best_bids[token_id] = book.best_bid
+        missing = [token_id for token_id in token_ids if token_id not in best_bids]
+        if missing:
+            best_bids.update(get_best_bids(client, missing))
+        return best_bids
+
+    def close(self):
+        """Close the WebSocket and stop its event loop."""
+        asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+class CheckSchedule:
+    """
+    Per-position poll schedule that backs off positions far from TP/SL.
+
+    After each check a position is next due after
+    ``interval * clamp(distance_pct / 2, 1, MAX_BACKOFF)`` seconds, where
+    distance_pct is how far its bid sits from the nearer trigger.
+    Positions not yet checked (or without bids) are always due.
+    """
+
+    MAX_BACKOFF = 30
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.next_check_at = {}
+
+    def due(self, token_ids, now: float) -> list:
+        """Return the tokens whose next check time has passed."""
+        next_check_at = self.next_check_at
+        return [token_id for token_id in token_ids if now >= next_check_at.get(token_id, 0.0)]
+
+    def record(self, token_id: str, best_bid: float, tp: float, sl: float, now: float):
+        """Schedule a token's next check from its bid's distance to TP/SL."""
+        distance_pct = min(tp - best_bid, best_bid - sl) / best_bid * 100
+        backoff = min(max(distance_pct / 2, 1), self.MAX_BACKOFF)
+        self.next_check_at[token_id] = now + self.interval * backoff
+
+
+_dotenv_loaded = False
+
+
+def _load_dotenv_once():
+    """Read .env on first use only; --loop ticks reuse the process environment."""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        load_dotenv()
+        _dotenv_loaded = True
+
+
 def init_client():
-    """Initialize CLOB client."""
-    load_dotenv()
+    """
+    Initialize CLOB client.
+
+    Order-book reads need no session of their own: py_clob_client sends
+    every request through one module-level keep-alive httpx client, so
+    all fetches in a sweep share warm connections.
+    """
+    _load_dotenv_once()
 
     host = "https://clob.polymarket.com"
     chain_id = 137
@@ -80,45 +261,95 @@ def init_client():
     return ClobClient(host=host, chain_id=chain_id, key=private_key)
 
 
-def simulate_fills(verbose: bool = True):
+_client = None
+
+
+def get_client():
+    """Return the process-wide CLOB client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = init_client()
+    return _client
+
+
+def simulate_fills(verbose: bool = True, stream: BookStream = None, client=None,
+                   schedule: CheckSchedule = None, report: bool = True):
     """
     Check all positions against current prices.
 
+    Args:
+        verbose: Print per-position details.
+        stream: Optional BookStream to read bids from instead of REST.
+        client: CLOB client to use; defaults to the shared get_client().
+        schedule: Optional CheckSchedule; only positions it reports as due
+            are fetched and checked, and their next check is rescheduled.
+        report: Write the report to stdout (as a single write). Pass False
+            to only compute and save the fills.
+
     Returns list of simulated fills.
     """
+    out = []
+    try:
+        return _simulate_fills(out, verbose, stream, client, schedule)
+    finally:
+        if report and out:
+            sys.stdout.write("".join(out))
+            sys.stdout.flush()
+
+
+def _simulate_fills(out: list, verbose: bool, stream: BookStream, client,
+                    schedule: CheckSchedule):
+    """simulate_fills body; report lines are appended to out."""
     positions = load_positions()
 
     if not positions:
-        print("No positions found.")
+        out.append("No positions found.\n")
         return []
 
-    print(f"\n{'='*60}")
-    print(f"  SIMULATING TP/SL FILLS - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"{'='*60}")
-    print(f"Positions: {len(positions)}\n")
-
-    client = init_client()
+    # One clock read per tick: every fill from this sweep shares its timestamp
+    now = datetime.now()
+    now_iso = now.isoformat()
+
+    out.append(f"\n{_SEP}\n")
+    out.append(f"  SIMULATING TP/SL FILLS - {now:%Y-%m-%d %H:%M:%S}\n")
+    out.append(_SEP + "\n")
+    out.append(f"Positions: {len(positions)}\n\n")
+
+    if schedule is not None:
+        clock = time.monotonic()
+        positions = {token_id: positions[token_id] for token_id in schedule.due(positions, clock)}
+        if not positions:
+            return []
+
+    if client is None:
+        client = get_client()
+    if stream is not None:
+        best_bids = stream.best_bids(client, list(positions))
+    else:
+        best_bids = get_best_bids(client, list(positions))
     results = []
 
     for token_id, pos in positions.items():
-        short_id = token_id[:12] + "..."
         entry = pos["entry_price"]
         tp = pos["tp"]
         sl = pos["sl"]
         size = pos["filled_size"]
 
         if verbose:
-            print(f"Position: {short_id}")
-            print(f"  Entry: ${entry:.4f} | TP: ${tp:.4f} | SL: ${sl:.4f}")
+            out.append(f"Position: {token_id[:12]}...\n")
+            out.append(f"  Entry: ${entry:.4f} | TP: ${tp:.4f} | SL: ${sl:.4f}\n")
 
-        # Get current price
-        best_bid = get_best_bid(client, token_id)
+        # Current price (fetched up front for all positions)
+        best_bid = best_bids[token_id]
 
         if best_bid <= 0:
             if verbose:
-                print(f"  Current: N/A (no bids)")
+                out.append(f"  Current: N/A (no bids)\n")
             continue
 
+        if schedule is not None:
+            schedule.record(token_id, best_bid, tp, sl, clock)
+
         # Calculate P&L
         pnl_pct = ((best_bid - entry) / entry) * 100
         pnl_usd = (best_bid - entry) * size
@@ -137,7 +368,7 @@ def simulate_fills(verbose: bool = True):
                 "size": size,
                 "pnl_usd": pnl_usd,
                 "pnl_pct": pnl_pct,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso,
             })
         elif best_bid <= sl:
             status = "SL HIT ❌"
@@ -151,45 +382,59 @@ def simulate_fills(verbose: bool = True):
                 "size": size,
                 "pnl_usd": pnl_usd,
                 "pnl_pct": pnl_pct,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso,
             })
 
         if verbose:
             color = "🟢" if pnl_pct > 0 else "🔴" if pnl_pct < 0 else "⚪"
-            print(f"  Current: ${best_bid:.4f} | P&L: {pnl_pct:+.2f}% (${pnl_usd:+.4f}) {color}")
-            print(f"  Status: {status}")
+            out.append(f"  Current: ${best_bid:.4f} | P&L: {pnl_pct:+.2f}% (${pnl_usd:+.4f}) {color}\n")
+            out.append(f"  Status: {status}\n")
 
             # Distance to TP/SL
             to_tp = ((tp - best_bid) / best_bid) * 100
             to_sl = ((best_bid - sl) / best_bid) * 100
-            print(f"  Distance: TP {to_tp:+.2f}% | SL {to_sl:+.2f}%")
-            print()
+            out.append(f"  Distance: TP {to_tp:+.2f}% | SL {to_sl:+.2f}%\n")
+            out.append("\n")
 
     # Summary
-    print(f"{'='*60}")
-    print("SUMMARY")
-    print(f"{'='*60}")
+    out.append(_SEP + "\n")
+    out.append("SUMMARY\n")
+    out.append(_SEP + "\n")
 
     tp_hits = [r for r in results if r["type"] == "take_profit"]
     sl_hits = [r for r in results if r["type"] == "stop_loss"]
 
-    print(f"Take Profits: {len(tp_hits)}")
-    print(f"Stop Losses: {len(sl_hits)}")
+    out.append(f"Take Profits: {len(tp_hits)}\n")
+    out.append(f"Stop Losses: {len(sl_hits)}\n")
 
     if results:
         total_pnl = sum(r["pnl_usd"] for r in results)
-        print(f"Simulated P&L: ${total_pnl:+.4f}")
+        out.append(f"Simulated P&L: ${total_pnl:+.4f}\n")
 
         # Save results
         save_simulation_results(results)
-        print(f"\nResults saved to data/simulation_results.json")
+        out.append(f"\nResults saved to data/{RESULTS_FILE.name}\n")
     else:
-        print("No fills triggered yet.")
+        out.append("No fills triggered yet.\n")
 
-    print()
+    out.append("\n")
     return results
 
 
+def run_simulation() -> dict:
+    """
+    Run one quiet simulation pass and return its totals.
+
+    Returns {"tp": take-profit count, "sl": stop-loss count, "pnl": USD}.
+    """
+    results = simulate_fills(verbose=False, report=False)
+    return {
+        "tp": sum(1 for r in results if r["type"] == "take_profit"),
+        "sl": sum(1 for r in results if r["type"] == "stop_loss"),
+        "pnl": sum(r["pnl_usd"] for r in results),
+    }
+
+
 def main():
     import argparse
 
@@ -200,7 +445,6 @@ def main():
     args = parser.parse_args()
 
     if args.loop > 0:
-        import time
         print(f"Running every {args.loop} seconds. Ctrl+C to stop.\n")
         try:
             while True:
@@ -21,8 +21,8 @@ import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
-import urllib.request
-import urllib.parse
+
+import requests
 
 # Add parent to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -35,21 +35,19 @@ class TelegramBot:
         self.token = token
         self.chat_id = chat_id
         self.base_url = f"https://api.telegram.org/bot{token}"
+        self._send_url = f"{self.base_url}/sendMessage"
+        # Keep-alive session: alerts after the first skip the TLS handshake
+        self.session = requests.Session()
 
     def send_message(self, text: str, parse_mode: str = "HTML") -> bool:
         """Send a message to the configured chat."""
         try:
-            url = f"{self.base_url}/sendMessage"
-            data = urllib.parse.urlencode({
+            resp = self.session.post(self._send_url, data={
                 "chat_id": self.chat_id,
                 "text": text,
                 "parse_mode": parse_mode,
-            }).encode()
-
-            req = urllib.request.Request(url, data=data)
-            with urllib.request.urlopen(req, timeout=10) as response:
-                result = json.loads(response.read())
-                return result.get("ok", False)
+            }, timeout=10)
+            return resp.json().get("ok", False)
 
         except Exception as e:
             print(f"Telegram error: {e}")
@@ -61,10 +59,16 @@ class TelegramBot:
         return self.send_message(text)
 
 
+_dotenv_loaded = False
+
+
 def load_env():
-    """Load environment variables."""
-    from dotenv import load_dotenv
-    load_dotenv()
+    """Load environment variables (.env is read once per process)."""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _dotenv_loaded = True
 
     token = os.getenv("TELEGRAM_BOT_TOKEN", "").strip()
     chat_id = os.getenv("TELEGRAM_CHAT_ID", "").strip()
@@ -85,8 +89,12 @@ def get_bot() -> Optional[TelegramBot]:
     return TelegramBot(token, chat_id)
 
 
-def send_position_alert(bot: TelegramBot, action: str, position: dict):
-    """Send alert for position events."""
+# Telegram caps messages at 4096 chars; leave room for the alert header
+MAX_ALERT_BODY_CHARS = 3800
+
+
+def format_position_alert(action: str, position: dict) -> Optional[tuple]:
+    """Build the (title, message, emoji) for a position event."""
     token_id = position.get("token_id", "unknown")[:12]
     entry = position.get("entry_price", 0)
     size = position.get("size", 0)
@@ -100,7 +108,7 @@ def send_position_alert(bot: TelegramBot, action: str, position: dict):
             f"Size: {size:.4f}\n"
             f"TP: ${tp:.4f} | SL: ${sl:.4f}"
         )
-        bot.send_alert("Position Opened", msg, "📈")
+        return "Position Opened", msg, "📈"
 
     elif action == "tp_hit":
         exit_price = position.get("exit_price", 0)
@@ -110,7 +118,7 @@ def send_position_alert(bot: TelegramBot, action: str, position: dict):
             f"Entry: ${entry:.4f} → Exit: ${exit_price:.4f}\n"
             f"P&L: <b>${pnl:+.4f}</b>"
         )
-        bot.send_alert("Take Profit Hit!", msg, "✅")
+        return "Take Profit Hit!", msg, "✅"
 
     elif action == "sl_hit":
         exit_price = position.get("exit_price", 0)
@@ -120,7 +128,40 @@ def send_position_alert(bot: TelegramBot, action: str, position: dict):
             f"Entry: ${entry:.4f} → Exit: ${exit_price:.4f}\n"
             f"P&L: <b>${pnl:+.4f}</b>"
         )
-        bot.send_alert("Stop Loss Hit", msg, "❌")
+        return "Stop Loss Hit", msg, "❌"
+
+    return None
+
+
+def send_position_alert(bot: TelegramBot, action: str, position: dict):
+    """Send alert for position events."""
+    alert = format_position_alert(action, position)
+    if alert:
+        bot.send_alert(*alert)
+
+
+def send_position_alerts(bot: TelegramBot, events: list):
+    """
+    Send several (action, position) events as few messages as possible.
+
+    A single event goes out as a normal alert; more are combined into one
+    message per MAX_ALERT_BODY_CHARS of text.
+    """
+    alerts = [a for a in (format_position_alert(action, pos) for action, pos in events) if a]
+    if len(alerts) == 1:
+        bot.send_alert(*alerts[0])
+        return
+
+    chunk, chunk_len = [], 0
+    for title, msg, emoji in alerts:
+        block = f"{emoji} <b>{title}</b>\n{msg}"
+        if chunk and chunk_len + len(block) > MAX_ALERT_BODY_CHARS:
+            bot.send_alert(f"New Fills ({len(chunk)})", "\n\n".join(chunk), "⚡")
+            chunk, chunk_len = [], 0
+        chunk.append(block)
+        chunk_len += len(block) + 2
+    if chunk:
+        bot.send_alert(f"New Fills ({len(chunk)})", "\n\n".join(chunk), "⚡")
 
 
 def send_daily_summary(bot: TelegramBot, positions: dict, results: list):
@@ -144,61 +185,86 @@ def send_daily_summary(bot: TelegramBot, positions: dict, results: list):
     bot.send_message(msg)
 
 
-def monitor_alerts(interval: int = 300):
+def monitor_alerts(interval: int = 300, use_websocket: bool = False, adaptive: bool = False):
     """
     Monitor for alerts and send to Telegram.
 
     Runs the fill simulation periodically and sends alerts for new fills.
+    With use_websocket, bids come from a streamed order book kept current
+    between ticks, so short intervals cost no extra REST requests.
+    With adaptive, positions far from their TP/SL are re-checked less
+    often than every tick (see CheckSchedule).
     """
     bot = get_bot()
     if not bot:
         return
 
-    from tools.simulate_fills import simulate_fills, load_positions
+    from tools.simulate_fills import (
+        BookStream, CheckSchedule, get_client, simulate_fills, load_simulation_results,
+    )
+
+    # Built once: every tick reuses the client and its connections
+    client = get_client()
+    stream = BookStream() if use_websocket else None
+    schedule = CheckSchedule(interval) if adaptive else None
 
     print(f"Starting alert monitor (interval: {interval}s)")
     print("Press Ctrl+C to stop\n")
 
-    # Track seen results to avoid duplicates
-    seen_fills = set()
-
-    # Load existing results
-    results_file = Path(__file__).parent.parent / "data" / "simulation_results.json"
-    if results_file.exists():
-        with open(results_file) as f:
-            existing = json.load(f)
-            for r in existing:
-                key = f"{r['token_id']}_{r['type']}_{r['timestamp'][:10]}"
-                seen_fills.add(key)
+    # Track seen (token_id, type, day) results to avoid duplicates. New fills
+    # are always stamped with the current day, so only today's keys can ever
+    # match; older days are dropped to keep the set bounded.
+    seen_day = f"{datetime.now():%Y-%m-%d}"
+    seen_fills = {
+        (r["token_id"], r["type"], r["timestamp"][:10])
+        for r in load_simulation_results()
+        if r["timestamp"][:10] == seen_day
+    }
 
     bot.send_alert("Bot Monitor Started", f"Checking every {interval}s", "🤖")
 
     try:
         while True:
-            print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Checking fills...")
+            now = datetime.now()
+            print(f"\n[{now:%H:%M:%S}] Checking fills...")
+
+            today = f"{now:%Y-%m-%d}"
+            if today != seen_day:
+                # Day rolled over: keep only the day that just ended (for a
+                # tick straddling midnight) and anything newer
+                seen_fills = {key for key in seen_fills if key[2] >= seen_day}
+                seen_day = today
 
-            results = simulate_fills(verbose=False)
+            results = simulate_fills(verbose=False, stream=stream, client=client, schedule=schedule)
 
+            # Collect this tick's new fills and alert on them together
+            events = []
             for r in results:
-                key = f"{r['token_id']}_{r['type']}_{r['timestamp'][:10]}"
+                key = (r["token_id"], r["type"], r["timestamp"][:10])
                 if key not in seen_fills:
                     seen_fills.add(key)
 
-                    # Send alert
                     action = "tp_hit" if r["type"] == "take_profit" else "sl_hit"
-                    send_position_alert(bot, action, {
+                    events.append((action, {
                         "token_id": r["token_id"],
                         "entry_price": r["entry_price"],
                         "exit_price": r["exit_price"],
                         "pnl_usd": r["pnl_usd"],
-                    })
-                    print(f"  Alert sent: {action} for {r['token_id'][:12]}...")
+                    }))
+
+            if events:
+                send_position_alerts(bot, events)
+                for action, position in events:
+                    print(f"  Alert sent: {action} for {position['token_id'][:12]}...")
 
             time.sleep(interval)
 
     except KeyboardInterrupt:
         print("\nStopping monitor...")
         bot.send_alert("Bot Monitor Stopped", "Manual shutdown", "🛑")
+    finally:
+        if stream is not None:
+            stream.close()
 
 
 def test_connection():
@@ -231,12 +297,16 @@ def main():
     parser.add_argument("--interval", "-i", type=int, default=300,
                         help="Monitor interval in seconds (default: 300)")
     parser.add_argument("--summary", "-s", action="store_true", help="Send daily summary")
+    parser.add_argument("--websocket", "-w", action="store_true",
+                        help="Monitor: stream order books instead of polling REST")
+    parser.add_argument("--adaptive", "-a", action="store_true",
+                        help="Monitor: check positions far from TP/SL less often")
     args = parser.parse_args()
 
     if args.test:
         test_connection()
     elif args.monitor:
-        monitor_alerts(args.interval)
+        monitor_alerts(args.interval, use_websocket=args.websocket, adaptive=args.adaptive)
     elif args.summary:
         bot = get_bot()
         if bot:
@@ -246,11 +316,8 @@ def main():
                 with open(pos_file) as f:
                     positions = json.load(f)
 
-            results = []
-            res_file = Path(__file__).parent.parent / "data" / "simulation_results.json"
-            if res_file.exists():
-                with open(res_file) as f:
-                    results = json.load(f)
+            from tools.simulate_fills import load_simulation_results
+            results = load_simulation_results()
 
             send_daily_summary(bot, positions, results)
             print("Summary sent!")
@@ -12,27 +12,77 @@ Listens for commands and executes actions:
 
 Usage:
     python tools/telegram_bot.py
+    python tools/telegram_bot.py --mode webhook   # needs TELEGRAM_WEBHOOK_URL
 """
 
+import heapq
 import json
+import mmap
 import os
 import sys
 import time
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from html import escape as html_escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Optional, Tuple
-import urllib.request
-import urllib.parse
 
+import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import ApiCreds, BalanceAllowanceParams, AssetType
 
 # Add parent to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+GAMMA_MARKETS_URL = "https://gamma-api.polymarket.com/markets"
+COMMAND_WORKERS = 4
+POLL_TIMEOUT = 50  # Telegram's maximum long-poll wait
+POLL_BACKOFF_MAX = 30
+FETCH_WORKERS = 8
+BID_REFRESH_INTERVAL = 5.0
+BID_STALE_AFTER = 15.0
+BID_REFRESH_IDLE = 600.0
+STATUS_CACHE_TTL = 5.0
+LINE_COUNT_CHUNK = 1 << 20
+LOG_TAIL_BYTES = 8192
+ALLOWED_UPDATES = json.dumps(["message"])
+
+POSITION_ROW = (
+    "<b>%d.</b> %s\n"
+    "<code>%s...</code>\n"
+    "   Entry: $%.4f | Size: %.4f\n"
+    "   TP: $%.4f | SL: $%.4f\n"
+    "%s\n"
+)
+POSITION_PNL = "   Now: $%.4f | PnL: %s$%.4f (%s%.2f%%)"
+
+
+@lru_cache(maxsize=256)
+def _position_title(question: str) -> str:
+    """Shorten and HTML-escape a market question for /positions (memoized)."""
+    if len(question) > 90:
+        question = question[:87] + "..."
+    return html_escape(question)
+
+
+def _pooled_session(pool_size: int) -> requests.Session:
+    """Build a keep-alive session holding up to pool_size connections per host."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=2, backoff_factor=0.3),
+    )
+    session.mount("https://", adapter)
+    return session
+
 
 class TelegramCommandBot:
     """Telegram bot that listens for commands and executes actions."""
@@ -40,52 +90,121 @@ class TelegramCommandBot:
     def __init__(self, token: str, chat_id: str):
         self.token = token
         self.chat_id = chat_id
+        # Updates carry chat ids as ints; compare against an int directly
+        # (a non-numeric chat_id can never match an update's chat id)
+        try:
+            self._chat_id_int = int(chat_id)
+        except ValueError:
+            self._chat_id_int = None
         self.base_url = f"https://api.telegram.org/bot{token}"
         self.last_update_id = 0
+        self._poll_failures = 0
         self.running = True
         self.project_dir = Path(__file__).parent.parent
         self.market_cache_path = self.project_dir / "data" / "market_cache.json"
         self.market_cache_ttl = 24 * 60 * 60
+        # Market questions are served from memory; the file is read once
+        # here and rewritten only when a lookup burst added entries
+        self._market_cache = self._load_market_cache()
+        self._market_cache_dirty = False
+        self._market_cache_lock = threading.Lock()
+
+        # /status state reused between calls: the pgrep result (briefly),
+        # the latest log file (until the logs dir changes) and its line
+        # count (extended by counting only appended bytes)
+        self._bot_running_cache: Optional[Tuple[float, bool]] = None
+        self._log_dir_state: Optional[Tuple[float, Path]] = None
+        self._log_state: Optional[dict] = None
+
+        self._clob: Optional[ClobClient] = None
+        self._clob_error: Optional[str] = None
+        self._clob_lock = threading.Lock()
+
+        # Best bids kept warm by a background thread while /positions is in
+        # use: {token_id: (best_bid, market_id, monotonic fetch time)}
+        self._bid_cache: dict = {}
+        self._bid_refresher: Optional[threading.Thread] = None
+        self._bid_refresher_lock = threading.Lock()
+        self._positions_requested_at = 0.0
+
+        # Parsed data files keyed by path: {path: ((mtime_ns, size), data)}
+        self._json_cache: dict = {}
+
+        self._commands = {
+            "/start": self.cmd_help,
+            "/help": self.cmd_help,
+            "/status": self.cmd_status,
+            "/positions": self.cmd_positions,
+            "/pos": self.cmd_positions,
+            "/simulate": self.cmd_simulate,
+            "/sim": self.cmd_simulate,
+            "/summary": self.cmd_summary,
+            "/balance": self.cmd_balance,
+            "/bal": self.cmd_balance,
+            "/logs": self.cmd_logs,
+            "/stop": self.cmd_stop,
+            "/whales": self.cmd_whales,
+        }
+
+        # Keep-alive sessions reuse warm TLS connections instead of
+        # handshaking per request. getUpdates long polls get their own pool
+        # so a hanging poll never holds a connection a reply is waiting for.
+        self.poll_http = _pooled_session(int(os.getenv("TELEGRAM_POLL_POOL_SIZE", "4")))
+        self.send_http = _pooled_session(int(os.getenv("TELEGRAM_SEND_POOL_SIZE", "16")))
 
     def send_message(self, text: str, parse_mode: str = "HTML") -> bool:
         """Send a message to the configured chat."""
+        url = f"{self.base_url}/sendMessage"
+        data = {
+            "chat_id": self.chat_id,
+            "text": text,
+            "parse_mode": parse_mode,
+        }
         try:
-            url = f"{self.base_url}/sendMessage"
-            data = urllib.parse.urlencode({
-                "chat_id": self.chat_id,
-                "text": text,
-                "parse_mode": parse_mode,
-            }).encode()
-
-            req = urllib.request.Request(url, data=data)
-            with urllib.request.urlopen(req, timeout=10) as response:
-                result = json.loads(response.read())
-                return result.get("ok", False)
+            try:
+                resp = self.send_http.post(url, data=data, timeout=10)
+            except requests.ConnectionError:
+                # Pooled connection retries exhausted: try once on a fresh
+                # connection rather than dropping the message
+                resp = requests.post(url, data=data, timeout=10)
+            return resp.json().get("ok", False)
 
         except Exception as e:
             print(f"Send error: {e}")
             return False
 
-    def get_updates(self, timeout: int = 30) -> list:
+    def get_updates(self, timeout: int = POLL_TIMEOUT) -> list:
         """Get new messages via long polling."""
         try:
-            url = f"{self.base_url}/getUpdates"
             params = {
                 "timeout": timeout,
                 "offset": self.last_update_id + 1,
+                "limit": 100,
+                # Only commands are handled; skip edits, channel posts, etc.
+                "allowed_updates": ALLOWED_UPDATES,
             }
-            url_with_params = f"{url}?{urllib.parse.urlencode(params)}"
-
-            req = urllib.request.Request(url_with_params)
-            with urllib.request.urlopen(req, timeout=timeout + 10) as response:
-                result = json.loads(response.read())
-                if result.get("ok"):
-                    return result.get("result", [])
-                return []
+            resp = self.poll_http.get(f"{self.base_url}/getUpdates", params=params, timeout=timeout + 10)
+            result = resp.json()
+            if result.get("ok"):
+                self._poll_failures = 0
+                updates = result.get("result", [])
+                if updates:
+                    # Acknowledge the batch as soon as it arrives, so the next
+                    # poll never re-delivers it even if a handler fails
+                    self.last_update_id = max(u["update_id"] for u in updates)
+                return updates
+            print(f"Poll error: {result.get('description', result)}")
 
         except Exception as e:
             print(f"Poll error: {e}")
-            return []
+
+        self._poll_failures += 1
+        return []
+
+    def _poll_backoff(self) -> None:
+        """After failed polls, wait 1s, 2s, 4s, ... (capped) before retrying."""
+        if self._poll_failures:
+            time.sleep(min(POLL_BACKOFF_MAX, 2 ** (self._poll_failures - 1)))
 
     def process_command(self, text: str, from_user: str) -> str:
         """Process a command and return response."""
@@ -95,26 +214,10 @@ class TelegramCommandBot:
         if "@" in text:
             text = text.split("@")[0]
 
-        if text == "/start" or text == "/help":
-            return self.cmd_help()
-        elif text == "/status":
-            return self.cmd_status()
-        elif text == "/positions" or text == "/pos":
-            return self.cmd_positions()
-        elif text == "/simulate" or text == "/sim":
-            return self.cmd_simulate()
-        elif text == "/summary":
-            return self.cmd_summary()
-        elif text == "/balance" or text == "/bal":
-            return self.cmd_balance()
-        elif text == "/logs":
-            return self.cmd_logs()
-        elif text == "/stop":
-            return self.cmd_stop()
-        elif text == "/whales":
-            return self.cmd_whales()
-        else:
-            return f"❓ Comando desconocido: {text}\n\nUsa /help para ver comandos disponibles."
+        handler = self._commands.get(text)
+        if handler:
+            return handler()
+        return f"❓ Comando desconocido: {text}\n\nUsa /help para ver comandos disponibles."
 
     def cmd_help(self) -> str:
         """Show available commands."""
@@ -136,9 +239,26 @@ class TelegramCommandBot:
 /help - Mostrar esta ayuda"""
 
     def _create_clob_client(self) -> Tuple[Optional[ClobClient], Optional[str]]:
-        """Create authenticated CLOB client for balance checks."""
-        load_dotenv()
-
+        """
+        Return the authenticated CLOB client, creating it on first use.
+
+        The client (or the configuration error) is kept for later commands;
+        call _reset_clob() after rotating credentials. The environment is
+        loaded once by main().
+        """
+        with self._clob_lock:
+            if self._clob is None and self._clob_error is None:
+                self._clob, self._clob_error = self._build_clob_client()
+            return self._clob, self._clob_error
+
+    def _reset_clob(self) -> None:
+        """Drop the cached CLOB client so the next command rebuilds it from .env."""
+        with self._clob_lock:
+            load_dotenv(override=True)
+            self._clob = None
+            self._clob_error = None
+
+    def _build_clob_client(self) -> Tuple[Optional[ClobClient], Optional[str]]:
         host = "https://clob.polymarket.com"
         chain_id = 137
 
@@ -169,36 +289,128 @@ class TelegramCommandBot:
 
         return client, None
 
+    def _load_json(self, path: Path):
+        """
+        Load a JSON data file, re-parsing only when it has changed on disk.
+
+        Returns None if the file does not exist. The returned object is
+        shared between calls and must not be modified.
+        """
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        key = (st.st_mtime_ns, st.st_size)
+        cached = self._json_cache.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+        with open(path) as f:
+            data = json.load(f)
+        self._json_cache[path] = (key, data)
+        return data
+
+    def _is_bot_running(self) -> bool:
+        """Check for the main bot process, reusing a result a few seconds old."""
+        now = time.monotonic()
+        if self._bot_running_cache and now - self._bot_running_cache[0] < STATUS_CACHE_TTL:
+            return self._bot_running_cache[1]
+
+        if os.path.isdir("/proc"):
+            # Read process command lines directly instead of forking pgrep
+            bot_running = False
+            for pid in os.listdir("/proc"):
+                if not pid.isdigit():
+                    continue
+                try:
+                    with open(f"/proc/{pid}/cmdline", "rb") as f:
+                        cmdline = f.read()
+                except OSError:
+                    continue
+                if b"python main_bot.py" in cmdline.replace(b"\0", b" "):
+                    bot_running = True
+                    break
+        else:
+            try:
+                result = subprocess.run(
+                    ["pgrep", "-f", "python main_bot.py"],
+                    capture_output=True, text=True
+                )
+                bot_running = bool(result.stdout.strip())
+            except:
+                bot_running = False
+
+        self._bot_running_cache = (now, bot_running)
+        return bot_running
+
+    def _latest_log(self) -> Optional[Path]:
+        """Return the newest bot_monitor log, rescanning only when logs/ changed."""
+        logs_dir = self.project_dir / "logs"
+        try:
+            dir_mtime = logs_dir.stat().st_mtime
+        except OSError:
+            return None
+        if self._log_dir_state and self._log_dir_state[0] == dir_mtime:
+            return self._log_dir_state[1]
+
+        # One scandir pass; DirEntry.stat() is cached, so each log is
+        # stat'ed once
+        with os.scandir(logs_dir) as it:
+            latest = max(
+                (e for e in it if e.name.startswith("bot_monitor_") and e.name.endswith(".log")),
+                key=lambda e: e.stat().st_mtime,
+                default=None,
+            )
+        latest_log = Path(latest.path) if latest else None
+        self._log_dir_state = (dir_mtime, latest_log)
+        return latest_log
+
+    def _count_log_lines(self, path: Path, st: os.stat_result) -> int:
+        """
+        Count lines in a log file, reading only what was appended since the
+        previous call when it is the same, grown file.
+        """
+        state = self._log_state
+        if (
+            state
+            and state["path"] == path
+            and state["inode"] == st.st_ino
+            and state["size"] <= st.st_size
+        ):
+            if state["size"] == st.st_size:
+                return state["lines"]
+            offset, lines = state["size"], state["lines"]
+        else:
+            offset, lines = 0, 0
+
+        if st.st_size > offset:
+            # Map the file and count newlines a chunk at a time: bytes.count
+            # runs in C, and no more than one chunk is copied at once
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                end = min(st.st_size, len(mm))
+                for start in range(offset, end, LINE_COUNT_CHUNK):
+                    lines += mm[start:min(start + LINE_COUNT_CHUNK, end)].count(b"\n")
+
+        self._log_state = {"path": path, "inode": st.st_ino, "size": st.st_size, "lines": lines}
+        return lines
+
     def cmd_status(self) -> str:
         """Get bot status."""
         # Check if main bot is running
-        try:
-            result = subprocess.run(
-                ["pgrep", "-f", "python main_bot.py"],
-                capture_output=True, text=True
-            )
-            bot_running = bool(result.stdout.strip())
-        except:
-            bot_running = False
+        bot_running = self._is_bot_running()
 
         # Get log info
-        log_files = list(self.project_dir.glob("logs/bot_monitor_*.log"))
-        if log_files:
-            latest_log = max(log_files, key=lambda x: x.stat().st_mtime)
-            log_lines = sum(1 for _ in open(latest_log))
-            log_age = time.time() - latest_log.stat().st_mtime
+        latest_log = self._latest_log()
+        if latest_log:
+            st = latest_log.stat()
+            log_lines = self._count_log_lines(latest_log, st)
+            log_age = time.time() - st.st_mtime
         else:
             log_lines = 0
             log_age = 0
 
         # Count positions
-        positions_file = self.project_dir / "data" / "positions.json"
-        if positions_file.exists():
-            with open(positions_file) as f:
-                positions = json.load(f)
-            num_positions = len(positions)
-        else:
-            num_positions = 0
+        positions = self._load_json(self.project_dir / "data" / "positions.json")
+        num_positions = len(positions) if positions is not None else 0
 
         status_emoji = "🟢" if bot_running else "🔴"
 
@@ -213,20 +425,67 @@ class TelegramCommandBot:
 
     def cmd_positions(self) -> str:
         """List current positions."""
-        positions_file = self.project_dir / "data" / "positions.json"
+        positions = self._load_json(self.project_dir / "data" / "positions.json")
 
-        if not positions_file.exists():
+        if positions is None:
             return "📭 No hay archivo de posiciones."
 
-        with open(positions_file) as f:
-            positions = json.load(f)
-
         if not positions:
             return "📭 No hay posiciones abiertas."
 
         client, _ = self._create_clob_client()
         use_live = client is not None
 
+        # Bids come from the background refresher's cache; only tokens it
+        # has not fetched yet (e.g. on the first /positions) cost a request
+        token_ids = list(positions)
+        self._positions_requested_at = time.monotonic()
+        bids = [(None, None)] * len(token_ids)
+        stale = [False] * len(token_ids)
+        if use_live:
+            self._start_bid_refresher()
+            missing = [token_id for token_id in token_ids if token_id not in self._bid_cache]
+            if missing:
+                self._refresh_bids(client, missing)
+            now = time.monotonic()
+            for i, token_id in enumerate(token_ids):
+                cached = self._bid_cache.get(token_id)
+                if cached:
+                    bids[i] = cached[:2]
+                    stale[i] = now - cached[2] > BID_STALE_AFTER
+
+        # Market questions are fetched for all positions at once: each is a
+        # network round trip, so doing them concurrently costs about one
+        # RTT instead of one per position
+        with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(token_ids))) as pool:
+            questions = [
+                positions[token_id].get("question") or self._cached_question(token_id)
+                for token_id in token_ids
+            ]
+
+            # Uncached questions whose market is known come from one batched
+            # Gamma request; only the rest are looked up token by token
+            pending = [i for i, question in enumerate(questions) if not question]
+            by_condition = self._batch_fetch_questions(
+                list({bids[i][1] for i in pending if bids[i][1]})
+            )
+            for i in pending:
+                question = by_condition.get(bids[i][1])
+                if question:
+                    questions[i] = question
+                    self._remember_question(token_ids[i], question)
+
+            pending = [i for i in pending if not questions[i]]
+            scans = {}
+            for i, question in zip(pending, pool.map(
+                lambda i: self._get_market_question(
+                    token_ids[i], condition_id=bids[i][1], client=client, scans=scans
+                ),
+                pending,
+            )):
+                questions[i] = question
+        self._flush_market_cache()
+
         lines = ["📈 <b>Posiciones Abiertas</b>\n"]
         if use_live:
             lines.append("📡 Precio actual: mejor bid (sellable)\n")
@@ -234,7 +493,9 @@ class TelegramCommandBot:
         total_value = 0.0
         total_pnl = 0.0
 
-        for i, (token_id, pos) in enumerate(positions.items(), 1):
+        rows = zip(token_ids, bids, questions, stale)
+        for i, (token_id, (current_price, _), question, is_stale) in enumerate(rows, 1):
+            pos = positions[token_id]
             entry = pos["entry_price"]
             size = pos.get("filled_size", pos.get("size", 0))
             tp = pos["tp"]
@@ -242,38 +503,23 @@ class TelegramCommandBot:
             value = entry * size
             total_value += value
 
-            current_price = None
-            condition_id = None
-            if use_live:
-                current_price, condition_id = self._get_best_bid_and_market(client, token_id)
-
-            question = pos.get("question")
-            if not question:
-                question = self._get_market_question(token_id, condition_id=condition_id, client=client)
-            if question and len(question) > 90:
-                question = question[:87] + "..."
-            title = question or f"Token {token_id[:10]}..."
-            title = html_escape(title)
+            tid_short = token_id[:10]
+            title = _position_title(question or f"Token {tid_short}...")
 
             pnl_line = "   Now: N/A"
             if current_price is not None:
                 pnl = (current_price - entry) * size
                 total_pnl += pnl
                 pnl_pct = (current_price - entry) / entry * 100 if entry else 0.0
-                pnl_sign = "+" if pnl >= 0 else ""
-                pct_sign = "+" if pnl_pct >= 0 else ""
-                pnl_line = (
-                    f"   Now: ${current_price:.4f} | "
-                    f"PnL: {pnl_sign}${pnl:.4f} ({pct_sign}{pnl_pct:.2f}%)"
+                pnl_line = POSITION_PNL % (
+                    current_price,
+                    "+" if pnl >= 0 else "", pnl,
+                    "+" if pnl_pct >= 0 else "", pnl_pct,
                 )
+                if is_stale:
+                    pnl_line += " (stale)"
 
-            lines.append(
-                f"<b>{i}.</b> {title}\n"
-                f"<code>{token_id[:10]}...</code>\n"
-                f"   Entry: ${entry:.4f} | Size: {size:.4f}\n"
-                f"   TP: ${tp:.4f} | SL: ${sl:.4f}\n"
-                f"{pnl_line}\n"
-            )
+            lines.append(POSITION_ROW % (i, title, tid_short, entry, size, tp, sl, pnl_line))
 
         lines.append(f"\n💰 <b>Total invertido: ${total_value:.2f}</b>")
         if use_live:
@@ -281,6 +527,37 @@ class TelegramCommandBot:
             lines.append(f"📊 <b>PNL total: {pnl_sign}${total_pnl:.4f}</b>")
         return "\n".join(lines)
 
+    def _refresh_bids(self, client, token_ids: list) -> None:
+        """Fetch best bids for token_ids concurrently into the bid cache."""
+        with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(token_ids))) as pool:
+            fetched = list(pool.map(lambda t: self._get_best_bid_and_market(client, t), token_ids))
+        now = time.monotonic()
+        for token_id, (best_bid, market_id) in zip(token_ids, fetched):
+            # (None, None) means the fetch failed: keep the older entry,
+            # which then shows as stale
+            if best_bid is not None or market_id is not None:
+                self._bid_cache[token_id] = (best_bid, market_id, now)
+
+    def _refresh_bids_loop(self) -> None:
+        """Keep position bids fresh while /positions has been used recently."""
+        positions_file = self.project_dir / "data" / "positions.json"
+        while self.running:
+            time.sleep(BID_REFRESH_INTERVAL)
+            if time.monotonic() - self._positions_requested_at < BID_REFRESH_IDLE:
+                try:
+                    client, _ = self._create_clob_client()
+                    positions = self._load_json(positions_file)
+                    if client and positions:
+                        self._refresh_bids(client, list(positions))
+                except Exception as e:
+                    print(f"Bid refresh error: {e}")
+
+    def _start_bid_refresher(self) -> None:
+        with self._bid_refresher_lock:
+            if self._bid_refresher is None:
+                self._bid_refresher = threading.Thread(target=self._refresh_bids_loop, daemon=True)
+                self._bid_refresher.start()
+
     def _get_best_bid_and_market(self, client, token_id: str) -> Tuple[Optional[float], Optional[str]]:
         """Fetch best bid and condition/market id for a token."""
         try:
@@ -356,9 +633,12 @@ class TelegramCommandBot:
         return {}
 
     def _save_market_cache(self, cache: dict) -> None:
+        # Write a sibling temp file and rename it over the cache, so a crash
+        # mid-write never leaves a truncated cache behind
+        tmp_path = self.market_cache_path.with_suffix(".tmp")
         try:
-            with open(self.market_cache_path, "w") as f:
-                json.dump(cache, f)
+            tmp_path.write_text(json.dumps(cache))
+            os.replace(tmp_path, self.market_cache_path)
         except Exception:
             pass
 
@@ -367,25 +647,73 @@ class TelegramCommandBot:
         token_id: str,
         condition_id: Optional[str] = None,
         client: Optional[ClobClient] = None,
+        scans: Optional[dict] = None,
     ) -> Optional[str]:
-        cache = self._load_market_cache()
-        entry = cache.get(token_id)
-        now = int(time.time())
-        if entry and isinstance(entry, dict):
-            ts = entry.get("ts", 0)
-            if now - ts < self.market_cache_ttl:
-                return entry.get("question")
+        question = self._cached_question(token_id)
+        if question:
+            return question
 
-        question = None
         if condition_id:
             question = self._fetch_question_by_condition(condition_id, client)
         if not question:
-            question = self._fetch_question_from_gamma(token_id)
+            question = self._fetch_question_from_gamma(token_id, scans)
         if question:
-            cache[token_id] = {"question": question, "ts": now}
-            self._save_market_cache(cache)
+            self._remember_question(token_id, question)
         return question
 
+    def _cached_question(self, token_id: str) -> Optional[str]:
+        """Return the cached question for a token if it is still fresh."""
+        entry = self._market_cache.get(token_id)
+        if entry and isinstance(entry, dict):
+            ts = entry.get("ts", 0)
+            if int(time.time()) - ts < self.market_cache_ttl:
+                return entry.get("question")
+        return None
+
+    def _remember_question(self, token_id: str, question: str) -> None:
+        with self._market_cache_lock:
+            self._market_cache[token_id] = {"question": question, "ts": int(time.time())}
+            self._market_cache_dirty = True
+
+    def _flush_market_cache(self) -> None:
+        """Write the market cache to disk if lookups added entries."""
+        with self._market_cache_lock:
+            if not self._market_cache_dirty:
+                return
+            cache = dict(self._market_cache)
+            self._market_cache_dirty = False
+        self._save_market_cache(cache)
+
+    def _batch_fetch_questions(self, condition_ids: list) -> dict:
+        """
+        Look up market questions for several condition ids in one Gamma call.
+
+        Returns {condition_id: question} for the markets Gamma returned.
+        """
+        if not condition_ids:
+            return {}
+        try:
+            resp = self.send_http.get(GAMMA_MARKETS_URL, params={
+                "condition_ids": condition_ids,
+                "limit": len(condition_ids),
+            }, timeout=10)
+            resp.raise_for_status()
+            data = resp.json()
+        except Exception:
+            return {}
+
+        if isinstance(data, dict):
+            data = data.get("data") or data.get("markets") or []
+        questions = {}
+        for m in data:
+            if not isinstance(m, dict):
+                continue
+            condition_id = m.get("conditionId") or m.get("condition_id")
+            question = m.get("question") or m.get("title")
+            if condition_id and question:
+                questions[condition_id] = question
+        return questions
+
     def _fetch_question_by_condition(
         self, condition_id: str, client: Optional[ClobClient] = None
     ) -> Optional[str]:
@@ -409,11 +737,9 @@ class TelegramCommandBot:
 
         data = None
         try:
-            params = {"condition_id": condition_id}
-            base = "https://gamma-api.polymarket.com/markets"
-            url = f"{base}?{urllib.parse.urlencode(params)}"
-            with urllib.request.urlopen(url, timeout=10) as resp:
-                data = json.loads(resp.read())
+            resp = self.send_http.get(GAMMA_MARKETS_URL, params={"condition_id": condition_id}, timeout=10)
+            resp.raise_for_status()
+            data = resp.json()
         except Exception:
             data = None
 
@@ -432,17 +758,28 @@ class TelegramCommandBot:
                 pass
         return None
 
-    def _fetch_question_from_gamma(self, token_id: str) -> Optional[str]:
-        def _extract_question(data):
+    def _fetch_question_from_gamma(self, token_id: str, scans: Optional[dict] = None) -> Optional[str]:
+        """
+        Find a token's market question on Gamma.
+
+        Args:
+            token_id: CLOB token id.
+            scans: Optional dict shared across lookups in one command; the
+                top-markets fallback scans are indexed once, stored there and
+                reused instead of being refetched for every missing token.
+        """
+        def _index_questions(data):
+            """Map every token id in a Gamma markets response to its question."""
             if not data:
-                return None
+                return {}
             if isinstance(data, dict):
                 markets = data.get("data") or data.get("markets") or []
             elif isinstance(data, list):
                 markets = data
             else:
-                return None
+                return {}
 
+            index = {}
             for m in markets:
                 if not isinstance(m, dict):
                     continue
@@ -456,37 +793,41 @@ class TelegramCommandBot:
                         ids = [raw_ids] if raw_ids else []
                 elif isinstance(raw_ids, list):
                     ids = raw_ids
-                ids = [str(x) for x in ids]
-                if token_id in ids:
-                    return question
-            return None
+                for x in ids:
+                    index.setdefault(str(x), question)
+            return index
 
         def _gamma_get(params):
-            base = "https://gamma-api.polymarket.com/markets"
-            url = f"{base}?{urllib.parse.urlencode(params)}"
             try:
-                with urllib.request.urlopen(url, timeout=10) as resp:
-                    return json.loads(resp.read())
+                resp = self.send_http.get(GAMMA_MARKETS_URL, params=params, timeout=10)
+                resp.raise_for_status()
+                return resp.json()
             except Exception:
                 return None
 
         # Try direct token filters first (best-effort).
         for key in ("clobTokenId", "clob_token_id", "token_id", "clobTokenIds"):
-            data = _gamma_get({key: token_id})
-            question = _extract_question(data)
+            question = _index_questions(_gamma_get({key: token_id})).get(token_id)
             if question:
                 return question
 
-        # Fallback: scan top markets by different orderings.
+        # Fallback: scan top markets by different orderings. Each listing is
+        # reduced to a token -> question index as soon as it is parsed, so
+        # only that small map (not the full market dicts) is kept around.
         for order in ("volume24hr", "volumeNum", "liquidityNum"):
-            data = _gamma_get({
-                "limit": 1000,
-                "order": order,
-                "ascending": "false",
-                "active": "true",
-                "closed": "false",
-            })
-            question = _extract_question(data)
+            if scans is not None and order in scans:
+                index = scans[order]
+            else:
+                index = _index_questions(_gamma_get({
+                    "limit": 1000,
+                    "order": order,
+                    "ascending": "false",
+                    "active": "true",
+                    "closed": "false",
+                }))
+                if scans is not None:
+                    scans[order] = index
+            question = index.get(token_id)
             if question:
                 return question
         return None
@@ -496,62 +837,48 @@ class TelegramCommandBot:
         self.send_message("⏳ Ejecutando simulación...")
 
         try:
-            result = subprocess.run(
-                ["python", str(self.project_dir / "tools" / "simulate_fills.py")],
-                capture_output=True, text=True, timeout=120,
-                cwd=str(self.project_dir)
-            )
-
-            output = result.stdout
-
-            # Parse summary from output
-            if "SUMMARY" in output:
-                summary_part = output.split("SUMMARY")[1]
-                lines = summary_part.strip().split("\n")
+            # In-process: reuses this interpreter's imports and the shared
+            # CLOB client instead of starting a new Python per /simulate
+            from tools.simulate_fills import run_simulation
+            totals = run_simulation()
 
-                tp_line = next((l for l in lines if "Take Profits" in l), "Take Profits: 0")
-                sl_line = next((l for l in lines if "Stop Losses" in l), "Stop Losses: 0")
-                pnl_line = next((l for l in lines if "P&L" in l), "")
+            if not (totals["tp"] or totals["sl"]):
+                return "✅ Simulación ejecutada. Sin fills detectados."
 
-                return f"""✅ <b>Simulación Completada</b>
+            return f"""✅ <b>Simulación Completada</b>
 
-{tp_line}
-{sl_line}
-{pnl_line}
+Take Profits: {totals["tp"]}
+Stop Losses: {totals["sl"]}
+Simulated P&L: ${totals["pnl"]:+.4f}
 
 <i>{datetime.now().strftime('%H:%M:%S')}</i>"""
-            else:
-                return "✅ Simulación ejecutada. Sin fills detectados."
 
-        except subprocess.TimeoutExpired:
-            return "⚠️ Simulación timeout (>2min)"
         except Exception as e:
             return f"❌ Error: {e}"
 
     def cmd_summary(self) -> str:
         """Send daily summary."""
-        positions_file = self.project_dir / "data" / "positions.json"
-        results_file = self.project_dir / "data" / "simulation_results.json"
-
         # Load positions
-        positions = {}
-        if positions_file.exists():
-            with open(positions_file) as f:
-                positions = json.load(f)
+        positions = self._load_json(self.project_dir / "data" / "positions.json") or {}
 
         # Load results
-        results = []
-        if results_file.exists():
-            with open(results_file) as f:
-                results = json.load(f)
+        from tools.simulate_fills import load_simulation_results
+        results = load_simulation_results()
 
         # Calculate stats
         total_positions = len(positions)
         total_value = sum(p["size"] * p["entry_price"] for p in positions.values())
 
-        tp_hits = [r for r in results if r.get("type") == "take_profit"]
-        sl_hits = [r for r in results if r.get("type") == "stop_loss"]
-        total_pnl = sum(r.get("pnl_usd", 0) for r in results)
+        # One pass over the results history for counts and P&L
+        tp_count = sl_count = 0
+        total_pnl = 0
+        for r in results:
+            kind = r.get("type")
+            if kind == "take_profit":
+                tp_count += 1
+            elif kind == "stop_loss":
+                sl_count += 1
+            total_pnl += r.get("pnl_usd", 0)
 
         return f"""📊 <b>Daily Summary</b>
 
@@ -560,8 +887,8 @@ class TelegramCommandBot:
   Value: ${total_value:.2f}
 
 <b>Resultados Simulados:</b>
-  ✅ Take Profits: {len(tp_hits)}
-  ❌ Stop Losses: {len(sl_hits)}
+  ✅ Take Profits: {tp_count}
+  ❌ Stop Losses: {sl_count}
   💰 P&L: ${total_pnl:+.4f}
 
 <i>{datetime.now().strftime('%Y-%m-%d %H:%M')}</i>"""
@@ -630,17 +957,24 @@ class TelegramCommandBot:
 
     def cmd_logs(self) -> str:
         """Get last log lines."""
-        log_files = list(self.project_dir.glob("logs/bot_monitor_*.log"))
+        latest_log = self._latest_log()
 
-        if not log_files:
+        if not latest_log:
             return "📭 No hay logs disponibles."
 
-        latest_log = max(log_files, key=lambda x: x.stat().st_mtime)
-
-        with open(latest_log) as f:
-            lines = f.readlines()
-
-        last_lines = lines[-10:]
+        with open(latest_log, "rb") as f:
+            # Read just the end of the file, doubling the window until it
+            # holds more than 10 lines (the first may be cut) or the whole file
+            size = f.seek(0, os.SEEK_END)
+            block = LOG_TAIL_BYTES
+            while True:
+                start = max(0, size - block)
+                f.seek(start)
+                tail = f.read(size - start).splitlines(keepends=True)
+                if start == 0 or len(tail) > 10:
+                    break
+                block *= 2
+            last_lines = [line.decode(errors="replace") for line in tail[-10:]]
 
         # Truncate long lines
         truncated = []
@@ -652,7 +986,7 @@ class TelegramCommandBot:
 
         return f"""📝 <b>Últimas 10 líneas</b>
 
-<code>{"".join(truncated[-10:])}</code>"""
+<code>{"".join(truncated)}</code>"""
 
     def cmd_stop(self) -> str:
         """Stop the bot (returns warning, actual stop requires confirmation)."""
@@ -670,22 +1004,19 @@ O usa: /status para verificar estado."""
         
         # Load stats
         stats = {}
-        if stats_file.exists():
-            try:
-                with open(stats_file) as f:
-                    stats = json.load(f)
-            except: pass
+        try:
+            stats = self._load_json(stats_file) or {}
+        except: pass
             
         # Load profiles
         top_whales = []
         if profiles_file.exists():
             try:
-                with open(profiles_file) as f:
-                    data = json.load(f)
-                    profiles = list(data.get("profiles", {}).values())
-                    # Sort by score
-                    profiles.sort(key=lambda x: x.get("score", 0), reverse=True)
-                    top_whales = profiles[:3]
+                data = self._load_json(profiles_file)
+                # Top 3 by score, without sorting every profile
+                top_whales = heapq.nlargest(
+                    3, data.get("profiles", {}).values(), key=lambda x: x.get("score", 0)
+                )
             except: pass
 
         copied = stats.get("signals_copied", 0)
@@ -708,39 +1039,59 @@ O usa: /status para verificar estado."""
                 
         return "\n".join(msg)
 
+    def _command_from_update(self, update: dict) -> Optional[Tuple[str, str]]:
+        """Return (text, username) if the update is a command from our chat."""
+        message = update.get("message", {})
+
+        # Only respond to configured chat; drop anything else before
+        # touching the rest of the message
+        if message.get("chat", {}).get("id") != self._chat_id_int:
+            return None
+
+        text = message.get("text", "")
+        if not text:
+            return None
+
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] Command: {text}")
+
+        if not text.startswith("/"):
+            return None
+        return text, message.get("from", {}).get("username", "")
+
+    def _run_command(self, text: str, from_user: str) -> str:
+        try:
+            return self.process_command(text, from_user)
+        except Exception as e:
+            return f"❌ Error: {e}"
+
+    def _handle_command(self, text: str, from_user: str) -> None:
+        """Run one command and send its reply (executes on a worker thread)."""
+        self.send_message(self._run_command(text, from_user))
+
     def run(self):
-        """Main loop to listen for commands."""
+        """
+        Main loop to listen for commands.
+
+        Commands run on a small worker pool, so a slow one (e.g. /positions
+        fetching order books, /simulate) never delays the next long poll or
+        the replies to other commands.
+        """
         print(f"🤖 Telegram bot started")
         print(f"   Listening for commands from chat_id: {self.chat_id}")
         print(f"   Press Ctrl+C to stop\n")
 
         self.send_message("🤖 <b>Bot Iniciado</b>\n\nEscribí /help para ver comandos.")
 
+        workers = ThreadPoolExecutor(max_workers=COMMAND_WORKERS)
         while self.running:
             try:
-                updates = self.get_updates(timeout=30)
+                updates = self.get_updates()
+                self._poll_backoff()
 
                 for update in updates:
-                    self.last_update_id = update.get("update_id", 0)
-
-                    message = update.get("message", {})
-                    chat = message.get("chat", {})
-                    from_user = message.get("from", {})
-                    text = message.get("text", "")
-
-                    # Only respond to configured chat
-                    if str(chat.get("id")) != self.chat_id:
-                        continue
-
-                    if not text:
-                        continue
-
-                    print(f"[{datetime.now().strftime('%H:%M:%S')}] Command: {text}")
-
-                    # Process command
-                    if text.startswith("/"):
-                        response = self.process_command(text, from_user.get("username", ""))
-                        self.send_message(response)
+                    command = self._command_from_update(update)
+                    if command:
+                        workers.submit(self._handle_command, *command)
 
             except KeyboardInterrupt:
                 print("\nShutting down...")
@@ -750,10 +1101,121 @@ O usa: /status para verificar estado."""
 
             except Exception as e:
                 print(f"Error: {e}")
-                time.sleep(5)
+                self._poll_failures += 1
+                self._poll_backoff()
+
+        workers.shutdown(wait=False, cancel_futures=True)
+
+    def set_webhook(self, url: str, secret: str) -> bool:
+        """Register url with Telegram so updates are pushed instead of polled."""
+        try:
+            resp = self.send_http.post(f"{self.base_url}/setWebhook", data={
+                "url": url,
+                "secret_token": secret,
+                "allowed_updates": ALLOWED_UPDATES,
+            }, timeout=10)
+            return resp.json().get("ok", False)
+        except Exception as e:
+            print(f"Webhook error: {e}")
+            return False
+
+    def delete_webhook(self) -> bool:
+        """Unregister the webhook so getUpdates polling works again."""
+        try:
+            resp = self.send_http.post(f"{self.base_url}/deleteWebhook", timeout=10)
+            return resp.json().get("ok", False)
+        except Exception as e:
+            print(f"Webhook error: {e}")
+            return False
+
+    def run_webhook(self, public_url: str, secret: str, port: int = 8443, host: str = "0.0.0.0"):
+        """
+        Receive updates on a webhook instead of long polling.
+
+        Telegram POSTs each update to <public_url>/webhook/<secret>. The
+        POST is answered 200 straight away and the command runs on the
+        worker pool, replying through send_message as run() does, so a slow
+        command never outlasts Telegram's webhook timeout. Updates at or
+        below the last handled update_id are redeliveries and are dropped.
+        public_url must be an HTTPS address that reaches this port, e.g.
+        through a reverse proxy.
+        """
+        bot = self
+        path = f"/webhook/{secret}"
+        workers = ThreadPoolExecutor(max_workers=COMMAND_WORKERS)
+        update_lock = threading.Lock()
+
+        def accept(update: dict) -> bool:
+            """Record update_id; False if it was already handled."""
+            update_id = update.get("update_id")
+            if update_id is None:
+                return True
+            with update_lock:
+                if update_id <= bot.last_update_id:
+                    return False
+                bot.last_update_id = update_id
+                return True
+
+        class WebhookHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if (
+                    self.path != path
+                    or self.headers.get("X-Telegram-Bot-Api-Secret-Token") != secret
+                ):
+                    self.send_response(403)
+                    self.end_headers()
+                    return
+
+                command = None
+                try:
+                    update = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                    if accept(update):
+                        command = bot._command_from_update(update)
+                except Exception as e:
+                    print(f"Webhook error: {e}")
+
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+                if command:
+                    workers.submit(bot._handle_command, *command)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), WebhookHandler)
+        if not self.set_webhook(public_url.rstrip("/") + path, secret):
+            print("❌ setWebhook failed")
+            server.server_close()
+            return
+
+        print(f"🤖 Telegram bot started (webhook on port {port})")
+        print(f"   Listening for commands from chat_id: {self.chat_id}")
+        print(f"   Press Ctrl+C to stop\n")
+
+        self.send_message("🤖 <b>Bot Iniciado</b>\n\nEscribí /help para ver comandos.")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nShutting down...")
+            self.send_message("🛑 Bot detenido.")
+        finally:
+            server.server_close()
+            self.delete_webhook()
+            workers.shutdown(wait=False, cancel_futures=True)
 
 
 def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Telegram command bot for Polymarket bot")
+    parser.add_argument("--mode", choices=("poll", "webhook"), default="poll",
+                        help="poll: getUpdates long polling (default); "
+                             "webhook: receive pushed updates")
+    args = parser.parse_args()
+
     load_dotenv()
 
     token = os.getenv("TELEGRAM_BOT_TOKEN", "").strip()
@@ -766,7 +1228,17 @@ def main():
         sys.exit(1)
 
     bot = TelegramCommandBot(token, chat_id)
-    bot.run()
+    if args.mode == "webhook":
+        public_url = os.getenv("TELEGRAM_WEBHOOK_URL", "").strip()
+        secret = os.getenv("TELEGRAM_WEBHOOK_SECRET", "").strip()
+        if not public_url or not secret:
+            print("❌ Webhook mode needs in .env:")
+            print("   TELEGRAM_WEBHOOK_URL=https://your.host")
+            print("   TELEGRAM_WEBHOOK_SECRET=random_token")
+            sys.exit(1)
+        bot.run_webhook(public_url, secret, port=int(os.getenv("TELEGRAM_WEBHOOK_PORT", "8443")))
+    else:
+        bot.run()
 
 
 if __name__ == "__main__":
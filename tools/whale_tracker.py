@@ -18,25 +18,64 @@ Usage:
 """
 
 import argparse
+import heapq
 import json
 import os
 import sys
+import threading
 import time
-from collections import defaultdict
-from datetime import datetime, timedelta
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 load_dotenv()
 
+# Last rendered log timestamp: [epoch second, "HH:MM:SS"]
+_TS_CACHE = [0, ""]
+
+
+def _log_timestamp() -> str:
+    """Local HH:MM:SS, formatted at most once per second."""
+    now = int(time.time())
+    if now != _TS_CACHE[0]:
+        _TS_CACHE[:] = [now, time.strftime("%H:%M:%S", time.localtime(now))]
+    return _TS_CACHE[1]
+
+
+def _trade_key(t: Dict) -> tuple:
+    """Identity of a trade row: one transaction yields a row per wallet/asset."""
+    return (t.get("transactionHash"), t.get("proxyWallet"), t.get("asset"))
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Parse a numeric API field, returning None instead of raising."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not value:
+        # None and "" are the usual gaps in data-api rows; skip the raise
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
 
 class WhaleTracker:
     """Track whale trading activity on Polymarket."""
 
     DATA_API = "https://data-api.polymarket.com"
     GAMMA_API = "https://gamma-api.polymarket.com"
+    TRADES_PAGE_SIZE = 500
+    TRADES_CACHE_SIZE = 128
+    TRADES_CACHE_TTL = 5.0
+    SEEN_HASHES_MAX = 1000
+    IDLE_SCANS_BEFORE_BACKOFF = 3
+    MAX_BACKOFF_FACTOR = 4
 
     def __init__(self, min_whale_size: float = 500, verbose: bool = True):
         self.min_whale_size = min_whale_size
@@ -46,6 +85,14 @@ class WhaleTracker:
             "User-Agent": "Mozilla/5.0 (compatible; PolyBot/1.0)",
             "Accept": "application/json",
         })
+        # Keep-alive pool sized for paginated fetches, with backoff on
+        # rate limits and gateway errors
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]),
+        )
+        self.session.mount("https://", adapter)
         self.trader_stats = defaultdict(lambda: {
             "total_volume": 0,
             "trade_count": 0,
@@ -55,21 +102,68 @@ class WhaleTracker:
             "last_seen": None,
             "profile": {},
         })
+        # LRU of /trades responses for conditional GETs:
+        # {(limit, offset): (etag, last_modified, fetched_at, trades)}
+        self._trades_cache = OrderedDict()
+        self._trades_cache_lock = threading.Lock()
+        # Newest trade timestamp folded into trader_stats, plus the
+        # _trade_key of rows seen at exactly that timestamp (ties arrive
+        # across polls)
+        self._max_seen_ts = None
+        self._keys_at_max_ts = set()
+        # Rows without a timestamp can't be ordered, so they are
+        # remembered by _trade_key instead
+        self._untimed_keys = set()
 
     def log(self, msg: str):
         if self.verbose:
-            print(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}")
+            print(f"[{_log_timestamp()}] {msg}")
 
-    def get_recent_trades(self, limit: int = 100) -> List[Dict]:
-        """Fetch recent trades from the data API."""
+    def get_recent_trades(self, limit: int = 100, offset: int = 0) -> List[Dict]:
+        """
+        Fetch recent trades from the data API.
+
+        Responses are cached per (limit, offset): an identical call within
+        TRADES_CACHE_TTL seconds is served from memory, and later ones are
+        revalidated with If-None-Match / If-Modified-Since so an unchanged
+        list costs a 304 instead of a full download. Each call returns a
+        fresh list, but the trade dicts in it are shared with the cache and
+        must not be modified.
+        """
+        key = (limit, offset)
+        with self._trades_cache_lock:
+            cached = self._trades_cache.get(key)
+            if cached:
+                self._trades_cache.move_to_end(key)
+        if cached and time.monotonic() - cached[2] < self.TRADES_CACHE_TTL:
+            return list(cached[3])
+
+        params = {"limit": limit}
+        if offset:
+            params["offset"] = offset
+        headers = {}
+        if cached:
+            if cached[0]:
+                headers["If-None-Match"] = cached[0]
+            if cached[1]:
+                headers["If-Modified-Since"] = cached[1]
         try:
             resp = self.session.get(
                 f"{self.DATA_API}/trades",
-                params={"limit": limit},
+                params=params,
+                headers=headers,
                 timeout=10
             )
+            if resp.status_code == 304 and cached:
+                trades = cached[3]
+                self._cache_trades(key, cached[0], cached[1], trades)
+                return list(trades)
             if resp.status_code == 200:
-                return resp.json()
+                trades = resp.json()
+                self._cache_trades(
+                    key, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), trades
+                )
+                return list(trades)
             else:
                 self.log(f"API returned {resp.status_code}")
                 return []
@@ -77,75 +171,146 @@ class WhaleTracker:
             self.log(f"Error fetching trades: {e}")
             return []
 
-    def filter_whale_trades(self, trades: List[Dict], min_usd: float = None) -> List[Dict]:
-        """Filter trades by USD value."""
+    def _cache_trades(self, key, etag, last_modified, trades) -> None:
+        with self._trades_cache_lock:
+            self._trades_cache[key] = (etag, last_modified, time.monotonic(), trades)
+            self._trades_cache.move_to_end(key)
+            if len(self._trades_cache) > self.TRADES_CACHE_SIZE:
+                self._trades_cache.popitem(last=False)
+
+    def get_trades_paginated(self, total: int, max_workers: int = 4) -> List[Dict]:
+        """
+        Fetch up to `total` recent trades as concurrent TRADES_PAGE_SIZE pages.
+
+        Pages are requested in parallel over the shared session and
+        concatenated in offset order. Trades that land between page fetches
+        shift the offsets on a live feed, so rows can repeat (or be missed)
+        at page boundaries; repeats are dropped on
+        (transactionHash, proxyWallet, asset, timestamp). Small totals fall
+        through to one get_recent_trades call.
+        """
+        if total <= self.TRADES_PAGE_SIZE:
+            return self.get_recent_trades(limit=total)
+
+        offsets = range(0, total, self.TRADES_PAGE_SIZE)
+
+        def fetch_page(offset: int) -> List[Dict]:
+            return self.get_recent_trades(
+                limit=min(self.TRADES_PAGE_SIZE, total - offset), offset=offset
+            )
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(offsets))) as pool:
+            pages = list(pool.map(fetch_page, offsets))
+
+        trades = []
+        seen = set()
+        for page in pages:
+            for t in page:
+                key = _trade_key(t) + (t.get("timestamp"),)
+                if key not in seen:
+                    seen.add(key)
+                    trades.append(t)
+        return trades
+
+    def filter_whale_trades(
+        self, trades: List[Dict], min_usd: float = None, top_k: Optional[int] = None
+    ) -> List[Dict]:
+        """Filter trades by USD value, largest first (only the top_k if given)."""
         if min_usd is None:
             min_usd = self.min_whale_size
 
+        # Most trades are below the threshold: only parse size/price for
+        # them, and build output dicts just for the ones that pass
         whale_trades = []
+        append = whale_trades.append
         for t in trades:
-            try:
-                size = float(t.get("size", 0))
-                price = float(t.get("price", 0))
-                usd_value = size * price
-
-                if usd_value >= min_usd:
-                    whale_trades.append({
-                        "usd_value": round(usd_value, 2),
-                        "size": size,
-                        "price": price,
-                        "side": t.get("side", "UNKNOWN"),
-                        "wallet": t.get("proxyWallet", ""),
-                        "name": t.get("name") or t.get("pseudonym") or "Anonymous",
-                        "market": t.get("title", "")[:50],
-                        "slug": t.get("slug", ""),
-                        "outcome": t.get("outcome", ""),
-                        "timestamp": t.get("timestamp"),
-                        "tx_hash": t.get("transactionHash", ""),
-                        "raw": t,
-                    })
-            except (ValueError, TypeError):
+            get = t.get
+            size = _to_float(get("size", 0))
+            price = _to_float(get("price", 0))
+            if size is None or price is None:
                 continue
+            usd_value = size * price
+            if usd_value < min_usd:
+                continue
+
+            append({
+                "usd_value": round(usd_value, 2),
+                "size": size,
+                "price": price,
+                "side": get("side", "UNKNOWN"),
+                "wallet": get("proxyWallet", ""),
+                "name": get("name") or get("pseudonym") or "Anonymous",
+                "market": get("title", "")[:50],
+                "slug": get("slug", ""),
+                "outcome": get("outcome", ""),
+                "timestamp": get("timestamp"),
+                "tx_hash": get("transactionHash", ""),
+                "raw": t,
+            })
 
         # Sort by USD value descending
+        if top_k is not None:
+            return heapq.nlargest(top_k, whale_trades, key=lambda x: x["usd_value"])
         whale_trades.sort(key=lambda x: x["usd_value"], reverse=True)
         return whale_trades
 
-    def build_leaderboard(self, trades: List[Dict]) -> List[Dict]:
-        """Build trader leaderboard from trade data."""
+    def reset_stats(self):
+        """Drop accumulated trader stats so the next leaderboard starts fresh."""
         self.trader_stats.clear()
+        self._max_seen_ts = None
+        self._keys_at_max_ts = set()
+        self._untimed_keys = set()
 
+    def build_leaderboard(
+        self, trades: List[Dict], incremental: bool = True, top_k: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Build trader leaderboard from trade data, optionally limited to top_k.
+
+        With incremental=True only trades newer than the last call are
+        folded into trader_stats, which is cumulative since the last
+        reset_stats(); repeated calls cost O(new trades). Pass
+        incremental=False (or call reset_stats()) to recompute from scratch.
+        """
+        if not incremental:
+            self.reset_stats()
+        trades = self._unseen_trades(trades)
+
+        stats_for = self.trader_stats
         for t in trades:
-            wallet = t.get("proxyWallet", "")
+            get = t.get
+            wallet = get("proxyWallet", "")
             if not wallet:
                 continue
 
-            try:
-                size = float(t.get("size", 0))
-                price = float(t.get("price", 0))
-                usd_value = size * price
-                side = t.get("side", "").upper()
-
-                stats = self.trader_stats[wallet]
-                stats["total_volume"] += usd_value
-                stats["trade_count"] += 1
-                stats["markets"].add(t.get("conditionId", ""))
-                stats["last_seen"] = t.get("timestamp")
-
-                if side == "BUY":
-                    stats["buys"] += 1
-                elif side == "SELL":
-                    stats["sells"] += 1
-
-                # Store profile info
-                if not stats["profile"]:
+            size = _to_float(get("size", 0))
+            price = _to_float(get("price", 0))
+            if size is None or price is None:
+                continue
+            usd_value = size * price
+            side = (get("side") or "").upper()
+
+            stats = stats_for[wallet]
+            stats["total_volume"] += usd_value
+            stats["trade_count"] += 1
+            stats["markets"].add(get("conditionId", ""))
+            stats["last_seen"] = get("timestamp")
+
+            if side == "BUY":
+                stats["buys"] += 1
+            elif side == "SELL":
+                stats["sells"] += 1
+
+            # Store profile info from the trade rows themselves; a wallet
+            # whose first trade was anonymous picks up a name from a later one
+            if not stats["profile"].get("name"):
+                name = get("name") or get("pseudonym")
+                if name or not stats["profile"]:
                     stats["profile"] = {
-                        "name": t.get("name") or t.get("pseudonym"),
-                        "bio": t.get("bio"),
-                        "image": t.get("profileImage"),
+                        "name": name,
+                        "bio": get("bio"),
+                        "image": get("profileImage"),
                     }
-            except:
-                continue
 
         # Convert to list and sort
         leaderboard = []
@@ -161,57 +326,103 @@ class WhaleTracker:
                 "avg_trade_size": round(stats["total_volume"] / max(1, stats["trade_count"]), 2),
             })
 
+        if top_k is not None:
+            return heapq.nlargest(top_k, leaderboard, key=lambda x: x["total_volume"])
         leaderboard.sort(key=lambda x: x["total_volume"], reverse=True)
         return leaderboard
 
+    def _unseen_trades(self, trades: List[Dict]) -> List[Dict]:
+        """Return trades not yet folded into trader_stats and advance the cursor."""
+        max_ts = self._max_seen_ts
+        at_max = self._keys_at_max_ts
+        untimed = self._untimed_keys
+        new = []
+        for t in trades:
+            ts = t.get("timestamp")
+            if ts is None:
+                key = _trade_key(t)
+                if key not in untimed:
+                    untimed.add(key)
+                    new.append(t)
+            elif max_ts is None or ts > max_ts:
+                new.append(t)
+            elif ts == max_ts and _trade_key(t) not in at_max:
+                new.append(t)
+
+        for t in new:
+            ts = t.get("timestamp")
+            if ts is None:
+                continue
+            if max_ts is None or ts > max_ts:
+                max_ts = ts
+                at_max = set()
+            if ts == max_ts:
+                at_max.add(_trade_key(t))
+        self._max_seen_ts = max_ts
+        self._keys_at_max_ts = at_max
+        return new
+
     def track_wallet(self, wallet_address: str, limit: int = 500) -> Dict:
         """Track a specific wallet's recent activity."""
-        trades = self.get_recent_trades(limit=limit)
+        return self.track_wallets([wallet_address], limit=limit)[wallet_address]
 
-        wallet_lower = wallet_address.lower()
-        wallet_trades = [
-            t for t in trades
-            if (t.get("proxyWallet") or "").lower() == wallet_lower
-        ]
+    def track_wallets(self, addresses: List[str], limit: int = 500) -> Dict[str, Dict]:
+        """
+        Track several wallets from a single fetch of recent trades.
 
-        if not wallet_trades:
-            return {"wallet": wallet_address, "trades": [], "summary": {}}
-
-        # Build summary
-        total_volume = 0
-        buys = sells = 0
-        markets = set()
-
-        for t in wallet_trades:
-            try:
-                size = float(t.get("size", 0))
-                price = float(t.get("price", 0))
-                total_volume += size * price
-                if t.get("side", "").upper() == "BUY":
-                    buys += 1
-                else:
-                    sells += 1
-                markets.add(t.get("slug", ""))
-            except:
-                pass
-
-        return {
-            "wallet": wallet_address,
-            "trades": wallet_trades,
-            "summary": {
-                "total_volume": round(total_volume, 2),
-                "trade_count": len(wallet_trades),
-                "buys": buys,
-                "sells": sells,
-                "unique_markets": len(markets),
-            }
+        Each trade's wallet is lowercased once and looked up in a set of the
+        watched addresses, so the cost is one pass regardless of how many
+        wallets are watched. Returns {address: track_wallet-style result}.
+        """
+        trades = self.get_trades_paginated(limit)
+
+        # Filter and summarise in one pass over the trades
+        acc = {
+            addr.lower(): {"trades": [], "total_volume": 0, "buys": 0, "sells": 0, "markets": set()}
+            for addr in addresses
         }
+        for t in trades:
+            get = t.get
+            a = acc.get((get("proxyWallet") or "").lower())
+            if a is None:
+                continue
+            a["trades"].append(t)
+            size = _to_float(get("size", 0))
+            price = _to_float(get("price", 0))
+            if size is None or price is None:
+                continue
+            a["total_volume"] += size * price
+            if (get("side") or "").upper() == "BUY":
+                a["buys"] += 1
+            else:
+                a["sells"] += 1
+            a["markets"].add(get("slug", ""))
+
+        results = {}
+        for addr in addresses:
+            a = acc[addr.lower()]
+            if not a["trades"]:
+                results[addr] = {"wallet": addr, "trades": [], "summary": {}}
+                continue
+            results[addr] = {
+                "wallet": addr,
+                "trades": a["trades"],
+                "summary": {
+                    "total_volume": round(a["total_volume"], 2),
+                    "trade_count": len(a["trades"]),
+                    "buys": a["buys"],
+                    "sells": a["sells"],
+                    "unique_markets": len(a["markets"]),
+                }
+            }
+        return results
 
-    def generate_copy_signals(self, min_consensus: int = 2) -> List[Dict]:
+    def generate_copy_signals(self, min_consensus: int = 2, top_k: Optional[int] = None) -> List[Dict]:
         """
         Generate copy trading signals based on whale consensus.
 
         If multiple whales are buying the same market, that's a signal.
+        Only the top_k most confident signals are returned when given.
         """
         trades = self.get_recent_trades(limit=200)
         whale_trades = self.filter_whale_trades(trades, min_usd=1000)
@@ -224,17 +435,17 @@ class WhaleTracker:
         })
 
         for wt in whale_trades:
-            key = f"{wt['slug']}:{wt['side']}"
-            market_signals[key]["whales"].add(wt["wallet"])
-            market_signals[key]["total_volume"] += wt["usd_value"]
-            market_signals[key]["trades"].append(wt)
+            data = market_signals[(wt["slug"], wt["side"])]
+            data["whales"].add(wt["wallet"])
+            data["total_volume"] += wt["usd_value"]
+            data["trades"].append(wt)
 
         # Generate signals
         signals = []
         for key, data in market_signals.items():
             whale_count = len(data["whales"])
             if whale_count >= min_consensus:
-                slug, side = key.rsplit(":", 1)
+                slug, side = key
                 signals.append({
                     "market": data["trades"][0]["market"] if data["trades"] else slug,
                     "slug": slug,
@@ -245,18 +456,39 @@ class WhaleTracker:
                     "whales": list(data["whales"])[:5],
                 })
 
+        if top_k is not None:
+            return heapq.nlargest(top_k, signals, key=lambda x: x["confidence"])
         signals.sort(key=lambda x: x["confidence"], reverse=True)
         return signals
 
     def monitor(self, interval: int = 30):
-        """Continuous monitoring mode."""
+        """
+        Continuous monitoring mode.
+
+        Trades older than the newest timestamp of the previous scan are
+        dropped before filtering. After IDLE_SCANS_BEFORE_BACKOFF scans
+        without new whales the sleep doubles (up to MAX_BACKOFF_FACTOR x
+        interval), and it halves again as soon as a whale shows up.
+        """
         self.log(f"Starting whale monitor (interval: {interval}s, threshold: ${self.min_whale_size})")
-        seen_hashes = set()
+        sleep_for = interval
+        max_sleep = interval * self.MAX_BACKOFF_FACTOR
+        idle_scans = 0
+        last_ts = None
+        # Insertion-ordered so the oldest hashes are evicted first
+        seen_hashes = OrderedDict()
         scan_count = 0
 
         while True:
             scan_count += 1
             trades = self.get_recent_trades(limit=50)
+            # /trades has no "since" parameter, so apply the cursor locally.
+            # Equal timestamps are kept; seen_hashes dedups those.
+            if last_ts is not None:
+                trades = [t for t in trades if t.get("timestamp") is None or t["timestamp"] >= last_ts]
+            stamps = [t["timestamp"] for t in trades if t.get("timestamp") is not None]
+            if stamps:
+                last_ts = max(stamps) if last_ts is None else max(last_ts, max(stamps))
             whale_trades = self.filter_whale_trades(trades)
 
             # Find new whale trades
@@ -264,30 +496,51 @@ class WhaleTracker:
             for wt in whale_trades:
                 tx = wt.get("tx_hash")
                 if tx and tx not in seen_hashes:
-                    seen_hashes.add(tx)
+                    seen_hashes[tx] = None
                     new_whales.append(wt)
+                    if len(seen_hashes) > self.SEEN_HASHES_MAX:
+                        seen_hashes.popitem(last=False)
 
             if new_whales:
-                print(f"\n{'='*60}")
-                print(f"NEW WHALE TRADES DETECTED (Scan #{scan_count})")
-                print(f"{'='*60}")
-                for wt in new_whales[:5]:
-                    self._print_whale_trade(wt)
-
-            # Keep seen_hashes manageable
-            if len(seen_hashes) > 1000:
-                seen_hashes = set(list(seen_hashes)[-500:])
+                out = [
+                    f"\n{'='*60}\n",
+                    f"NEW WHALE TRADES DETECTED (Scan #{scan_count})\n",
+                    f"{'='*60}\n",
+                ]
+                out.extend(self._format_whale_trade(wt) for wt in new_whales[:5])
+                sys.stdout.write("".join(out))
+                sys.stdout.flush()
 
-            time.sleep(interval)
+            if new_whales:
+                idle_scans = 0
+                if sleep_for > interval:
+                    sleep_for = max(interval, sleep_for // 2)
+                    self.log(f"Activity detected, interval back to {sleep_for}s")
+            else:
+                idle_scans += 1
+                if idle_scans >= self.IDLE_SCANS_BEFORE_BACKOFF and sleep_for < max_sleep:
+                    idle_scans = 0
+                    sleep_for = min(max_sleep, sleep_for * 2)
+                    self.log(f"No new whales, backing off to {sleep_for}s")
+
+            time.sleep(sleep_for)
+
+    def _format_whale_trade(self, wt: Dict) -> str:
+        """Render a whale trade as a newline-terminated block."""
+        lines = [
+            "",
+            f"  ${wt['usd_value']:,.2f} {wt['side']}",
+            f"  Market: {wt['market']}",
+            f"  Trader: {wt['name']} ({wt['wallet'][:12]}...)",
+            f"  Size: {wt['size']} @ ${wt['price']}",
+        ]
+        if wt.get("tx_hash"):
+            lines.append(f"  TX: https://polygonscan.com/tx/{wt['tx_hash']}")
+        return "\n".join(lines) + "\n"
 
     def _print_whale_trade(self, wt: Dict):
-        """Pretty print a whale trade."""
-        print(f"\n  ${wt['usd_value']:,.2f} {wt['side']}")
-        print(f"  Market: {wt['market']}")
-        print(f"  Trader: {wt['name']} ({wt['wallet'][:12]}...)")
-        print(f"  Size: {wt['size']} @ ${wt['price']}")
-        if wt.get("tx_hash"):
-            print(f"  TX: https://polygonscan.com/tx/{wt['tx_hash']}")
+        """Pretty print a whale trade with a single write."""
+        sys.stdout.write(self._format_whale_trade(wt))
 
 
 def main():
@@ -333,15 +586,15 @@ def main():
                 print(f"  {side} {size} @ {price} - {market}...")
 
     elif args.leaderboard:
-        trades = tracker.get_recent_trades(limit=args.limit)
-        leaderboard = tracker.build_leaderboard(trades)
+        trades = tracker.get_trades_paginated(args.limit)
+        leaderboard = tracker.build_leaderboard(trades, top_k=20)
 
         print(f"\nTOP TRADERS (from {len(trades)} trades):")
         print("-" * 70)
         print(f"{'#':<3} {'Name':<20} {'Volume':>12} {'Trades':>8} {'Avg':>10} {'B/S':>8}")
         print("-" * 70)
 
-        for i, t in enumerate(leaderboard[:20], 1):
+        for i, t in enumerate(leaderboard, 1):
             name = (t["name"] or "Anonymous")[:18]
             print(
                 f"{i:<3} {name:<20} "
@@ -352,13 +605,13 @@ def main():
             )
 
     elif args.signals:
-        signals = tracker.generate_copy_signals()
+        signals = tracker.generate_copy_signals(top_k=10)
 
         print("\nCOPY TRADING SIGNALS:")
         print("-" * 70)
 
         if signals:
-            for i, s in enumerate(signals[:10], 1):
+            for i, s in enumerate(signals, 1):
                 print(f"\n{i}. {s['action']} - {s['market']}")
                 print(f"   Whales: {s['whale_count']} | Volume: ${s['total_volume']:,.0f}")
                 print(f"   Confidence: {s['confidence']}%")
@@ -367,14 +620,14 @@ def main():
 
     else:
         # Default: show recent whale trades
-        trades = tracker.get_recent_trades(limit=args.limit)
-        whale_trades = tracker.filter_whale_trades(trades)
+        trades = tracker.get_trades_paginated(args.limit)
+        whale_trades = tracker.filter_whale_trades(trades, top_k=15)
 
         print(f"\nRecent whale trades (>${args.min_size}):")
         print("-" * 70)
 
         if whale_trades:
-            for wt in whale_trades[:15]:
+            for wt in whale_trades:
                 tracker._print_whale_trade(wt)
         else:
             print(f"No trades found above ${args.min_size}")